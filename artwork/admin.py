@@ -1,4 +1,5 @@
 from django.contrib import admin
-from .models import Artwork
+from .models import Artwork, TrendingWatermark
 
 admin.site.register(Artwork)
+admin.site.register(TrendingWatermark)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ArtworkConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'artwork'
+
+    def ready(self):
+        # Keeps the CategoryStat rollup in step with every Artwork write
+        from . import signals  # noqa: F401
@@ -0,0 +1,68 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+
+FEATURED_KEY_PREFIX = "artwork:featured"
+FEATURED_VERSION_KEY = "artwork:featured:version"
+FEATURED_LOCK_KEY = "artwork:featured:lock"
+
+FEATURED_FRESH_SECONDS = 300  # Rebuild after this even without invalidation
+FEATURED_STALE_SECONDS = 24 * 60 * 60  # How long a stale copy may still be served
+FEATURED_LOCK_SECONDS = 30
+# The only query parameters that change the payload; others are ignored so
+# junk or reordered parameters can't mint new cache entries
+FEATURED_QUERY_PARAMS = ("page",)
+
+
+def invalidate_featured_artworks():
+    # Bumping the version marks every cached copy stale without deleting it,
+    # so visitors keep getting the old payload while one worker rebuilds
+    try:
+        cache.incr(FEATURED_VERSION_KEY)
+    except ValueError:
+        cache.set(FEATURED_VERSION_KEY, 1, None)
+
+
+def featured_cache_key(request):
+    params = []
+    for name in sorted(FEATURED_QUERY_PARAMS):
+        value = request.query_params.get(name)
+        if value is not None:
+            params.append((name, str(int(value)) if value.isdigit() else value))
+    # Scheme and host stay in the key because pagination links are absolute
+    raw = f"{request.scheme}://{request.get_host()}{request.path}?{urlencode(params)}"
+    return f"{FEATURED_KEY_PREFIX}:{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+def get_featured_artworks(request, build):
+    """
+    Return the cached featured-artworks payload for this page, calling
+    build() to produce it when missing or stale.
+
+    Only the request that wins the rebuild lock calls build(); concurrent
+    requests get the stale copy until the new one is stored.
+    """
+    key = featured_cache_key(request)
+    version = cache.get_or_set(FEATURED_VERSION_KEY, 0, None)
+    entry = cache.get(key)
+
+    if entry and entry["version"] == version and entry["expires"] > time.time():
+        return entry["data"]
+
+    locked = cache.add(FEATURED_LOCK_KEY, 1, FEATURED_LOCK_SECONDS)
+    if entry and not locked:
+        return entry["data"]
+
+    try:
+        data = build()
+        cache.set(key, {
+            "version": version,
+            "expires": time.time() + FEATURED_FRESH_SECONDS,
+            "data": data,
+        }, FEATURED_STALE_SECONDS)
+    finally:
+        if locked:
+            cache.delete(FEATURED_LOCK_KEY)
+    return data
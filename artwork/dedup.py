@@ -0,0 +1,110 @@
+import threading
+
+from .models import Artwork
+
+# Hashes within this many differing bits (out of 64) count as the same image
+DUPLICATE_MAX_DISTANCE = 6
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over integer hashes with Hamming distance. Lookups
+    within a small radius only visit the branches the triangle inequality
+    allows, so they stay far below a linear scan as the tree grows.
+    """
+
+    def __init__(self):
+        self.root = None  # (hash, [ids], {distance: child})
+
+    def add(self, value, item):
+        if self.root is None:
+            self.root = (value, [item], {})
+            return
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (value, [item], {})
+                return
+            node = child
+
+    def search(self, value, max_distance):
+        """Return [(distance, item)] for every item within max_distance."""
+        results = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node_value, items, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= max_distance:
+                results.extend((distance, item) for item in items)
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return results
+
+
+class ArtworkHashIndex:
+    """
+    Per-process BK-tree of artwork image hashes. It loads lazily and then
+    only pulls rows newer than the last id it has seen, so artworks created
+    by other workers are picked up with one indexed query per lookup.
+    """
+
+    def __init__(self):
+        self.tree = BKTree()
+        self.last_id = 0
+        # (id, hash) pairs already in the tree; add() and refresh() can both see a new row
+        self.indexed = set()
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        rows = (
+            Artwork.objects.filter(id__gt=self.last_id)
+            .exclude(image_hash="")
+            .order_by("id")
+            .values_list("id", "image_hash")
+        )
+        for artwork_id, image_hash in rows.iterator(chunk_size=2000):
+            self._add(artwork_id, image_hash)
+            self.last_id = artwork_id
+
+    def _add(self, artwork_id, image_hash):
+        if (artwork_id, image_hash) not in self.indexed:
+            self.indexed.add((artwork_id, image_hash))
+            self.tree.add(int(image_hash, 16), artwork_id)
+
+    def add(self, artwork_id, image_hash):
+        with self.lock:
+            self._add(artwork_id, image_hash)
+
+    def find_duplicates(self, image_hash, max_distance=DUPLICATE_MAX_DISTANCE, exclude_id=None):
+        """Ids of existing artworks that look like image_hash, closest first."""
+        value = int(image_hash, 16)
+        with self.lock:
+            self.refresh()
+            candidates = self.tree.search(value, max_distance)
+
+        # The tree may hold deleted rows or hashes of replaced images, so
+        # confirm against the current database values
+        current = dict(
+            Artwork.objects.filter(id__in=[artwork_id for _, artwork_id in candidates])
+            .exclude(id=exclude_id)
+            .values_list("id", "image_hash")
+        )
+        matches = sorted(
+            (hamming(value, int(current[artwork_id], 16)), artwork_id)
+            for _, artwork_id in candidates
+            if current.get(artwork_id)
+        )
+        return [artwork_id for distance, artwork_id in matches if distance <= max_distance]
+
+
+hash_index = ArtworkHashIndex()
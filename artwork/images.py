@@ -0,0 +1,100 @@
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db.models.functions import Now
+from PIL import Image, ImageOps
+
+
+# Longest edge in pixels for each rendition; originals are never upscaled
+RENDITION_SIZES = {
+    "thumbnail": 320,
+    "medium": 960,
+    "large": 1920,
+}
+RENDITION_FORMAT = "WEBP"
+RENDITION_EXTENSION = "webp"
+RENDITION_QUALITY = 80
+
+
+def _open_oriented(field_file):
+    """Open an uploaded image with its EXIF orientation applied."""
+    field_file.open("rb")
+    try:
+        image = Image.open(field_file)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    finally:
+        field_file.close()
+
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    return image
+
+
+def rendition_path(artwork, name):
+    stem = os.path.splitext(os.path.basename(artwork.image.name))[0]
+    return f"artworks/renditions/{artwork.pk}/{stem}_{name}.{RENDITION_EXTENSION}"
+
+
+def generate_renditions(artwork):
+    """
+    Write resized WebP copies of artwork.image and store their paths in
+    artwork.renditions. Returns the {name: path} map.
+    """
+    storage = artwork.image.storage
+    source = _open_oriented(artwork.image)
+
+    renditions = {}
+    for name, size in RENDITION_SIZES.items():
+        resized = source.copy()
+        resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+        buffer = BytesIO()
+        resized.save(buffer, RENDITION_FORMAT, quality=RENDITION_QUALITY, method=4)
+
+        path = rendition_path(artwork, name)
+        if storage.exists(path):
+            storage.delete(path)
+        renditions[name] = storage.save(path, ContentFile(buffer.getvalue()))
+
+    delete_renditions(artwork, keep=renditions.values())
+    artwork.renditions = renditions
+    type(artwork).objects.filter(pk=artwork.pk).update(renditions=renditions, updated_at=Now())
+    return renditions
+
+
+def delete_renditions(artwork, keep=()):
+    storage = artwork.image.storage
+    for path in (artwork.renditions or {}).values():
+        if path not in keep and storage.exists(path):
+            storage.delete(path)
+
+
+
+HASH_SIZE = 8  # 8x8 bits -> 64-bit difference hash
+
+
+def perceptual_hash(file):
+    """
+    64-bit difference hash (dHash) of an image as a 16-char hex string.
+    Visually identical images (re-encoded, resized, re-uploaded) get hashes
+    within a few bits of each other.
+    """
+    file.seek(0)
+    with Image.open(file) as image:
+        # Let the JPEG decoder downscale while decoding instead of inflating
+        # a full-size bitmap we are about to shrink to 9x8 pixels
+        image.draft("L", (HASH_SIZE * 8, HASH_SIZE * 8))
+        image = ImageOps.exif_transpose(image).convert("L")
+        pixels = list(image.resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS).getdata())
+    file.seek(0)
+
+    bits = 0
+    for row in range(HASH_SIZE):
+        for col in range(HASH_SIZE):
+            left = pixels[row * (HASH_SIZE + 1) + col]
+            right = pixels[row * (HASH_SIZE + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return f"{bits:016x}"
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from artwork.models import Artwork
+from artwork.similarity import update_feature_vector
+
+
+class Command(BaseCommand):
+    help = "Compute similarity feature vectors for approved artworks uploaded before recommendations existed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Recompute vectors that already exist")
+        parser.add_argument("--all-statuses", action="store_true", help="Include pending and rejected artworks")
+
+    def handle(self, *args, **options):
+        queryset = Artwork.objects.exclude(image="")
+        if not options["all_statuses"]:
+            queryset = queryset.filter(approval_status="approved")
+        if not options["force"]:
+            queryset = queryset.filter(feature_vector__isnull=True)
+
+        done = failed = 0
+        for artwork in queryset.only("id", "image", "approval_status").iterator(chunk_size=100):
+            try:
+                update_feature_vector(artwork)
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"Artwork {artwork.pk}: {e}")
+                continue
+            done += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Computed {done} feature vectors ({failed} failed)."))
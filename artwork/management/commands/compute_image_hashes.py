@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from artwork.images import perceptual_hash
+from artwork.models import Artwork
+
+
+class Command(BaseCommand):
+    help = "Compute perceptual hashes for artworks uploaded before duplicate detection existed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Recompute hashes that already exist")
+
+    def handle(self, *args, **options):
+        queryset = Artwork.objects.all()
+        if not options["force"]:
+            queryset = queryset.filter(image_hash="")
+
+        done = failed = 0
+        for artwork in queryset.only("id", "image").iterator(chunk_size=100):
+            try:
+                with artwork.image.open("rb") as image:
+                    image_hash = perceptual_hash(image)
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"Artwork {artwork.pk}: {e}")
+                continue
+            Artwork.objects.filter(pk=artwork.pk).update(image_hash=image_hash)
+            done += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Hashed {done} artworks ({failed} failed)."))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from artwork.images import generate_renditions
+from artwork.models import Artwork
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnail/medium/large renditions for existing artworks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("artwork_ids", nargs="*", type=int, help="Only process these artworks")
+        parser.add_argument("--force", action="store_true", help="Regenerate renditions that already exist")
+
+    def handle(self, *args, **options):
+        queryset = Artwork.objects.all()
+        if options["artwork_ids"]:
+            queryset = queryset.filter(id__in=options["artwork_ids"])
+        if not options["force"]:
+            queryset = queryset.filter(renditions={})
+
+        done = failed = 0
+        for artwork in queryset.iterator(chunk_size=100):
+            try:
+                generate_renditions(artwork)
+                done += 1
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"Artwork {artwork.pk}: {e}")
+
+        self.stdout.write(self.style.SUCCESS(f"Generated renditions for {done} artworks ({failed} failed)."))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from artwork.stats import rebuild_category_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the CategoryStat rollup from the Artwork table"
+
+    def handle(self, *args, **options):
+        count = rebuild_category_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} category stat rows."))
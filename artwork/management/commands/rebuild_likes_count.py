@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from artwork.models import Artwork
+
+
+class Command(BaseCommand):
+    help = "Rebuild the stored Artwork.likes_count column from the Like table"
+
+    def add_arguments(self, parser):
+        parser.add_argument("artwork_ids", nargs="*", type=int, help="Only rebuild these artworks")
+
+    def handle(self, *args, **options):
+        queryset = Artwork.objects.all()
+        if options["artwork_ids"]:
+            queryset = queryset.filter(id__in=options["artwork_ids"])
+
+        updated = queryset.rebuild_likes_count()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt likes_count for {updated} artworks."))
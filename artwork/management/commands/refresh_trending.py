@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from artwork.trending import rebuild_trending_scores, refresh_trending_scores
+
+
+class Command(BaseCommand):
+    help = "Fold new likes into Artwork.trending_score (run from cron every few minutes)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rebuild", action="store_true", help="Recompute every score from the full Like table")
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            count = rebuild_trending_scores()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt trending scores for {count} artworks."))
+        else:
+            count = refresh_trending_scores()
+            self.stdout.write(self.style.SUCCESS(f"Folded {count} new likes into trending scores."))
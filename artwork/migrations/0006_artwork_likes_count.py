@@ -0,0 +1,34 @@
+# Generated by Django 5.1.5 on 2026-10-16 22:39
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_likes_count(apps, schema_editor):
+    Artwork = apps.get_model('artwork', 'Artwork')
+    Like = apps.get_model('artwork', 'Like')
+    like_counts = (
+        Like.objects.filter(artwork=OuterRef('pk'))
+        .order_by()
+        .values('artwork')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    Artwork.objects.update(likes_count=Coalesce(Subquery(like_counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0005_alter_artwork_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artwork',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_likes_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-16 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0006_artwork_likes_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artwork',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
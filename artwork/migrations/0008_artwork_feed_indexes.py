@@ -0,0 +1,23 @@
+# Generated by Django 5.1.5 on 2026-10-16 22:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0007_artwork_renditions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='artwork',
+            index=models.Index(fields=['-submission_date', '-id'], name='artwork_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='artwork',
+            index=models.Index(fields=['approval_status', '-submission_date', '-id'], name='artwork_status_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.5 on 2026-10-16 22:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0010_like_user_recent_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artwork',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='artwork.artwork'),
+        ),
+        migrations.AddField(
+            model_name='artwork',
+            name='image_hash',
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+    ]
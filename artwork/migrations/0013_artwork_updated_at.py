@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-16 22:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0012_artwork_review_lease'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artwork',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.5 on 2026-10-16 22:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0014_artwork_image_metadata'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artwork',
+            name='feature_vector',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AddIndex(
+            model_name='artwork',
+            index=models.Index(fields=['updated_at'], name='artwork_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.5 on 2026-10-16 23:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_category_stats(apps, schema_editor):
+    Artwork = apps.get_model('artwork', 'Artwork')
+    CategoryStat = apps.get_model('artwork', 'CategoryStat')
+    rows = Artwork.objects.values('category', 'approval_status', 'artist').annotate(artwork_count=Count('id')).order_by()
+    CategoryStat.objects.bulk_create(
+        CategoryStat(
+            category=row['category'],
+            approval_status=row['approval_status'],
+            artist_id=row['artist'],
+            artwork_count=row['artwork_count'],
+        ) for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0016_artwork_trending_score'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('sketch', 'Sketch'), ('canvas', 'Canvas'), ('wallart', 'Wall Art'), ('digital', 'Digital'), ('photography', 'Photography')], max_length=20)),
+                ('approval_status', models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')], max_length=10)),
+                ('artwork_count', models.IntegerField(default=0)),
+                ('artist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='category_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('artist', 'category', 'approval_status'), name='category_stat_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_category_stats, migrations.RunPython.noop),
+    ]
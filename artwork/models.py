@@ -1,7 +1,33 @@
-from django.db import models
+from django.db import models, transaction
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from users.models import CustomUser
+from users.image_metadata import ImageMetadataModel
+from users.search import SearchVectorMixin
 
-class Artwork(models.Model):
+
+class ArtworkQuerySet(models.QuerySet):
+    def with_list_data(self):
+        # Pull the artist in the same join so list serialization doesn't
+        # issue extra queries per row (likes_count is a stored column).
+        # The feature vector is only read by the similarity index.
+        return self.select_related("artist").defer("feature_vector")
+
+    def rebuild_likes_count(self):
+        # Recompute the denormalized counter from the Like table
+        like_counts = (
+            Like.objects.filter(artwork=models.OuterRef("pk"))
+            .order_by()
+            .values("artwork")
+            .annotate(total=models.Count("id"))
+            .values("total")
+        )
+        return self.update(likes_count=Coalesce(models.Subquery(like_counts), 0))
+
+
+class Artwork(SearchVectorMixin, ImageMetadataModel):
     
     
     CATEGORY_CHOICES = [
@@ -24,16 +50,57 @@ class Artwork(models.Model):
     image = models.ImageField(upload_to='artworks/')
     artist = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='artworks')
     submission_date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     approval_status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
     feedback = models.TextField(blank=True, null=True)  # ✅ New field for rejection feedback
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='sketch')
+    likes_count = models.PositiveIntegerField(default=0)  # Maintained by like/unlike, see rebuild_likes_count
+    trending_score = models.FloatField(default=0, editable=False)  # Log of time-decayed likes, see artwork/trending.py
+    renditions = models.JSONField(default=dict, blank=True)  # {"thumbnail": path, ...}, see artwork/images.py
+    search_vector = SearchVectorField(null=True, editable=False)
+    image_hash = models.CharField(max_length=16, blank=True, editable=False)  # Perceptual hash, see artwork/dedup.py
+    feature_vector = models.BinaryField(null=True)  # float32 colour/layout vector, see artwork/similarity.py
+    duplicate_of = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='duplicates')
+    reviewer = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='review_leases')
+    review_lease_expires_at = models.DateTimeField(null=True, blank=True)  # Set by ArtworkViewSet.claim
+
+    search_vector_fields = [('title', 'A'), ('description', 'B')]
+
+    objects = ArtworkQuerySet.as_manager()
 
     class Meta:
         ordering = ['-submission_date']
+        indexes = [
+            # Keyset pagination of the feed on (submission_date, id), see users/pagination.py
+            models.Index(fields=['-submission_date', '-id'], name='artwork_feed_idx'),
+            models.Index(fields=['approval_status', '-submission_date', '-id'], name='artwork_status_feed_idx'),
+            GinIndex(fields=['search_vector'], name='artwork_search_idx'),
+            models.Index(fields=['-trending_score', '-id'], name='artwork_trending_idx'),
+            # Lets the similarity index sync only recently changed rows
+            models.Index(fields=['updated_at'], name='artwork_updated_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # One transaction, so artwork/signals.py can lock the row while it
+        # moves the artwork's CategoryStat bucket
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def is_leased_to_other(self, user):
+        return (
+            self.reviewer_id is not None
+            and self.reviewer_id != user.pk
+            and self.review_lease_expires_at is not None
+            and self.review_lease_expires_at > timezone.now()
+        )
+
+    def release_review_lease(self):
+        self.reviewer = None
+        self.review_lease_expires_at = None
+
 
 
 class Like(models.Model):
@@ -43,6 +110,43 @@ class Like(models.Model):
 
     class Meta:
         unique_together = ('user', 'artwork')  # Ensure users can only like an artwork once
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='like_user_recent_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} liked {self.artwork.title}"
+
+
+class TrendingWatermark(models.Model):
+    """
+    Single row recording the last Like folded into Artwork.trending_score,
+    so each refresh only reads likes added since the previous one.
+    """
+    last_like_id = models.BigIntegerField(default=0)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Trending up to like {self.last_like_id}"
+
+
+
+class CategoryStat(models.Model):
+    """
+    Rollup of how many artworks each artist has per (category, status).
+    Kept current by artwork/stats.py as artworks are created, deleted or
+    moderated, so analytics read a few hundred rows instead of the whole
+    Artwork table. rebuild_category_stats recomputes it from scratch.
+    """
+    category = models.CharField(max_length=20, choices=Artwork.CATEGORY_CHOICES)
+    approval_status = models.CharField(max_length=10, choices=Artwork.STATUS_CHOICES)
+    artist = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='category_stats')
+    artwork_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['artist', 'category', 'approval_status'], name='category_stat_unique'),
+        ]
 
     def __str__(self):
-        return f"{self.user.username} liked {self.artwork.title}"
\ No newline at end of file
+        return f"{self.artist_id} {self.category}/{self.approval_status}: {self.artwork_count}"
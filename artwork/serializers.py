@@ -1,28 +1,68 @@
 from rest_framework import serializers
-from .models import Artwork
+from .models import Artwork, Like
 from users.models import CustomUser
+from uploads.serializers import UploadSessionMixin
 
-class ArtworkSerializer(serializers.ModelSerializer):
-    image = serializers.ImageField(use_url=True) 
+
+def get_liked_artwork_ids(user, artwork_ids):
+    # One query for a whole page of artworks
+    if not user or not user.is_authenticated:
+        return set()
+    return set(Like.objects.filter(user=user, artwork_id__in=artwork_ids).values_list('artwork_id', flat=True))
+
+
+class ArtworkListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        artworks = list(data.all() if hasattr(data, 'all') else data)
+        request = self.context.get('request')
+        if 'liked_artwork_ids' not in self.context:
+            self.context['liked_artwork_ids'] = get_liked_artwork_ids(
+                getattr(request, 'user', None), [artwork.pk for artwork in artworks]
+            )
+        return super().to_representation(artworks)
+
+
+class ArtworkSerializer(UploadSessionMixin, serializers.ModelSerializer):
+    # Optional when a finished chunked upload is passed as `upload_id`
+    image = serializers.ImageField(use_url=True, required=False)
     artist_name = serializers.SerializerMethodField()
-    likes_count = serializers.SerializerMethodField()  # Add likes count
+    renditions = serializers.SerializerMethodField()
+    has_liked = serializers.SerializerMethodField()
 
     
     class Meta:
         model = Artwork
-        fields = ['id', 'title', 'description', 'image', 'artist', 'artist_name', 'feedback', 'approval_status', 'submission_date', 'category', "likes_count"]  # ✅ Include 'id' and 'approval_status'
-        read_only_fields = ['approval_status', 'feedback', 'artist', 'submission_date']
+        fields = ['id', 'title', 'description', 'image', 'artist', 'artist_name', 'feedback', 'approval_status', 'submission_date', 'category', "likes_count", "renditions", "has_liked", "duplicate_of", "reviewer", "review_lease_expires_at", "image_width", "image_height", "aspect_ratio", "file_size", "dominant_colors", "color_family", "upload_id"]  # ✅ Include 'id' and 'approval_status'
+        read_only_fields = ['approval_status', 'feedback', 'artist', 'submission_date', 'likes_count', 'duplicate_of', 'reviewer', 'review_lease_expires_at']
+        list_serializer_class = ArtworkListSerializer
         
         
     def get_artist_name(self, obj):
         # This method will return the artist's first and last name
         return f"{obj.artist.first_name} {obj.artist.last_name}"    
+
+
+    def get_renditions(self, obj):
+        # Map of rendition name to URL; empty until the renditions are generated
+        request = self.context.get("request")
+        storage = obj.image.storage
+        urls = {}
+        for name, path in (obj.renditions or {}).items():
+            url = storage.url(path)
+            urls[name] = request.build_absolute_uri(url) if request else url
+        return urls
+
+
+    def get_has_liked(self, obj):
+        # Lists resolve this for the whole page in ArtworkListSerializer
+        liked_ids = self.context.get('liked_artwork_ids')
+        if liked_ids is None:
+            request = self.context.get('request')
+            liked_ids = get_liked_artwork_ids(getattr(request, 'user', None), [obj.pk])
+        return obj.pk in liked_ids
         
         
     def create(self, validated_data):
         request = self.context.get('request')  # Get the request from the context
         validated_data['artist'] = request.user  # Assign the logged-in user
-        return super().create(validated_data)
-
-    def get_likes_count(self, obj):
-        return obj.likes.count()  # Return the number of likes
\ No newline at end of file
+        return super().create(validated_data)
\ No newline at end of file
@@ -0,0 +1,61 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import Artwork
+from .stats import category_stat_key, move_category_stat
+
+# Field names (and attnames) that decide an artwork's CategoryStat bucket,
+# in category_stat_key order
+CATEGORY_STAT_FIELDS = (('category',), ('approval_status',), ('artist', 'artist_id'))
+
+
+def touches_category_stat(update_fields):
+    return update_fields is None or any(
+        name in update_fields for names in CATEGORY_STAT_FIELDS for name in names
+    )
+
+
+def locked_category_stat_key(pk):
+    # Artwork.save() and deletes run in a transaction, so this lock is held
+    # until the rollup has moved; a concurrent approve/reject of the same
+    # row waits and then reads the bucket this write left behind
+    return (
+        Artwork.objects.select_for_update().filter(pk=pk)
+        .values_list('category', 'approval_status', 'artist_id').first()
+    )
+
+
+@receiver(pre_save, sender=Artwork)
+def remember_category_stat_key(sender, instance, raw, update_fields, **kwargs):
+    # Read the stored bucket rather than trusting the instance, which may
+    # have been loaded before another request moderated the row
+    instance._stored_category_stat_key = None
+    if raw or instance.pk is None or not touches_category_stat(update_fields):
+        return
+    instance._stored_category_stat_key = locked_category_stat_key(instance.pk)
+
+
+@receiver(post_save, sender=Artwork)
+def update_category_stat_on_save(sender, instance, raw, update_fields, **kwargs):
+    if raw or not touches_category_stat(update_fields):
+        return
+    old_key = instance._stored_category_stat_key
+    new_key = category_stat_key(instance)
+    if update_fields is not None and old_key is not None:
+        # Fields left out of update_fields kept their stored values
+        new_key = tuple(
+            new if any(name in update_fields for name in names) else old
+            for names, new, old in zip(CATEGORY_STAT_FIELDS, new_key, old_key)
+        )
+    move_category_stat(old_key, new_key)
+
+
+@receiver(pre_delete, sender=Artwork)
+def remember_deleted_category_stat_key(sender, instance, **kwargs):
+    # Read now: the row is gone by post_delete
+    instance._stored_category_stat_key = locked_category_stat_key(instance.pk) or category_stat_key(instance)
+
+
+@receiver(post_delete, sender=Artwork)
+def update_category_stat_on_delete(sender, instance, **kwargs):
+    move_category_stat(instance._stored_category_stat_key, None)
@@ -0,0 +1,155 @@
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.db.models.functions import Now
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .models import Artwork
+
+# Colour histogram over HSV: 8 hues x 3 saturations x 3 values
+HUE_BINS, SAT_BINS, VAL_BINS = 8, 3, 3
+# Layout signature: mean-centred 8x8 luminance thumbnail
+LUMA_SIZE = 8
+SAMPLE_SIZE = 64
+COLOR_WEIGHT = 1.0
+LAYOUT_WEIGHT = 0.5
+FEATURE_DTYPE = np.float32
+FEATURE_DIM = HUE_BINS * SAT_BINS * VAL_BINS + LUMA_SIZE * LUMA_SIZE
+
+
+def compute_feature_vector(field_file):
+    """
+    Unit-length float32 vector describing an image's colours and rough
+    layout. The dot product of two vectors is their cosine similarity.
+    """
+    field_file.open("rb")
+    try:
+        with Image.open(field_file) as image:
+            image.draft("RGB", (SAMPLE_SIZE * 2, SAMPLE_SIZE * 2))
+            sample = ImageOps.exif_transpose(image).convert("RGB")
+            sample = sample.resize((SAMPLE_SIZE, SAMPLE_SIZE), Image.Resampling.BILINEAR)
+    finally:
+        field_file.close()
+
+    hsv = np.asarray(sample.convert("HSV"), dtype=np.uint16).reshape(-1, 3)
+    bins = (
+        (hsv[:, 0] * HUE_BINS >> 8) * SAT_BINS * VAL_BINS
+        + (hsv[:, 1] * SAT_BINS >> 8) * VAL_BINS
+        + (hsv[:, 2] * VAL_BINS >> 8)
+    )
+    histogram = np.bincount(bins, minlength=HUE_BINS * SAT_BINS * VAL_BINS).astype(FEATURE_DTYPE)
+    # Square root of the distribution (Hellinger) already has unit length
+    histogram = np.sqrt(histogram / histogram.sum())
+
+    luma = np.asarray(sample.convert("L").resize((LUMA_SIZE, LUMA_SIZE), Image.Resampling.BOX), dtype=FEATURE_DTYPE).ravel()
+    luma -= luma.mean()
+    norm = np.linalg.norm(luma)
+    if norm:
+        luma /= norm
+
+    vector = np.concatenate([histogram * COLOR_WEIGHT, luma * LAYOUT_WEIGHT])
+    return (vector / np.linalg.norm(vector)).astype(FEATURE_DTYPE)
+
+
+def update_feature_vector(artwork):
+    vector = compute_feature_vector(artwork.image)
+    artwork.feature_vector = vector.tobytes()
+    Artwork.objects.filter(pk=artwork.pk).update(feature_vector=artwork.feature_vector, updated_at=Now())
+    similarity_index.add(artwork.pk, vector, artwork.approval_status == 'approved')
+    return vector
+
+
+def load_vector(value):
+    return np.frombuffer(bytes(value), dtype=FEATURE_DTYPE)
+
+
+class SimilarityIndex:
+    """
+    Per-process matrix of artwork feature vectors searched with one
+    vectorized dot product. Like ArtworkHashIndex it loads lazily; after
+    that it re-reads only rows whose updated_at moved since the last sync,
+    at most once every `refresh_interval` seconds.
+    """
+    refresh_interval = 30
+    # Re-read a little history so rows committed late by slow transactions aren't missed
+    sync_overlap = timedelta(minutes=2)
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.vectors = np.empty((0, FEATURE_DIM), dtype=FEATURE_DTYPE)
+        self.approved = np.empty(0, dtype=bool)
+        self.positions = {}
+        self.pending = []
+        self.synced_at = None
+        self.checked_at = None
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        if self.checked_at is not None and time.monotonic() - self.checked_at < self.refresh_interval:
+            return
+        started_at = timezone.now()
+        rows = Artwork.objects.filter(feature_vector__isnull=False)
+        if self.synced_at is not None:
+            rows = rows.filter(updated_at__gte=self.synced_at - self.sync_overlap)
+        rows = rows.values_list("id", "feature_vector", "approval_status")
+        for artwork_id, vector, approval_status in rows.iterator(chunk_size=2000):
+            self._put(artwork_id, load_vector(vector), approval_status == 'approved')
+        self._flush()
+        self.synced_at = started_at
+        self.checked_at = time.monotonic()
+
+    def add(self, artwork_id, vector, approved):
+        with self.lock:
+            self._put(artwork_id, vector, approved)
+            self._flush()
+
+    def _put(self, artwork_id, vector, approved):
+        position = self.positions.get(artwork_id)
+        if position is None:
+            self.pending.append((artwork_id, vector, approved))
+        else:
+            self.vectors[position] = vector
+            self.approved[position] = approved
+
+    def _flush(self):
+        # Grow the arrays once per batch rather than once per row
+        pending = self.pending
+        if not pending:
+            return
+        start = len(self.ids)
+        for offset, (artwork_id, _, _) in enumerate(pending):
+            self.positions[artwork_id] = start + offset
+        self.ids = np.concatenate([self.ids, np.array([row[0] for row in pending], dtype=np.int64)])
+        self.vectors = np.vstack([self.vectors, np.stack([row[1] for row in pending])])
+        self.approved = np.concatenate([self.approved, np.array([row[2] for row in pending], dtype=bool)])
+        pending.clear()
+
+    def vector_for(self, artwork_id):
+        with self.lock:
+            self.refresh()
+            position = self.positions.get(artwork_id)
+            return None if position is None else self.vectors[position].copy()
+
+    def search(self, vector, limit, exclude_id=None):
+        """[(artwork id, similarity)] of the closest approved artworks, best first."""
+        with self.lock:
+            self.refresh()
+            scores = self.vectors @ vector
+            scores[~self.approved] = -np.inf
+            if exclude_id in self.positions:
+                scores[self.positions[exclude_id]] = -np.inf
+            ids = self.ids
+
+        limit = min(limit, int(np.isfinite(scores).sum()))
+        if limit <= 0:
+            return []
+        # Partial selection is O(n); only the winners get sorted
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+
+similarity_index = SimilarityIndex()
@@ -0,0 +1,106 @@
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Artwork, CategoryStat
+
+STATUS_COUNTS_KEY = "artwork:status_counts"
+STATUS_COUNTS_SECONDS = 30
+
+
+def get_status_counts():
+    """
+    Artwork counts per approval status plus the total, computed with one
+    conditional-aggregate query and cached briefly because the admin
+    dashboard polls it.
+    """
+    counts = cache.get(STATUS_COUNTS_KEY)
+    if counts is None:
+        counts = Artwork.objects.aggregate(
+            pending=Count('id', filter=Q(approval_status='pending')),
+            approved=Count('id', filter=Q(approval_status='approved')),
+            rejected=Count('id', filter=Q(approval_status='rejected')),
+            total=Count('id'),
+        )
+        cache.set(STATUS_COUNTS_KEY, counts, STATUS_COUNTS_SECONDS)
+    return counts
+
+
+def invalidate_status_counts():
+    cache.delete(STATUS_COUNTS_KEY)
+
+
+def category_stat_key(artwork):
+    return (artwork.category, artwork.approval_status, artwork.artist_id)
+
+
+def apply_category_stat_changes(changes):
+    """
+    Apply {(category, approval_status, artist_id): delta} to CategoryStat.
+    Counts move with F() so concurrent requests can't overwrite each other;
+    the first artwork in a bucket creates its row. Single-artwork writes
+    reach here through artwork/signals.py.
+    """
+    for (category, approval_status, artist_id), delta in changes.items():
+        if not delta:
+            continue
+        bucket = CategoryStat.objects.filter(category=category, approval_status=approval_status, artist_id=artist_id)
+        if bucket.update(artwork_count=F('artwork_count') + delta) or delta < 0:
+            # A missing bucket has nothing to take away, e.g. its artist is being deleted
+            continue
+        try:
+            with transaction.atomic():
+                CategoryStat.objects.create(
+                    category=category, approval_status=approval_status, artist_id=artist_id, artwork_count=delta
+                )
+        except IntegrityError:
+            # Another request created the row first
+            bucket.update(artwork_count=F('artwork_count') + delta)
+
+
+def move_category_stat(old_key, new_key):
+    """Record an artwork moving between buckets; None means created or deleted."""
+    if old_key == new_key:
+        return
+    changes = Counter()
+    if old_key is not None:
+        changes[old_key] -= 1
+    if new_key is not None:
+        changes[new_key] += 1
+    apply_category_stat_changes(changes)
+
+
+def rebuild_category_stats():
+    with transaction.atomic():
+        CategoryStat.objects.all().delete()
+        rows = Artwork.objects.values('category', 'approval_status', 'artist').annotate(artwork_count=Count('id')).order_by()
+        CategoryStat.objects.bulk_create(
+            CategoryStat(
+                category=row['category'],
+                approval_status=row['approval_status'],
+                artist_id=row['artist'],
+                artwork_count=row['artwork_count'],
+            ) for row in rows
+        )
+    return CategoryStat.objects.count()
+
+
+def get_category_analytics():
+    """Per-category totals and status counts, summed from the rollup."""
+    def status_sum(status):
+        return Coalesce(Sum('artwork_count', filter=Q(approval_status=status)), 0)
+
+    return (
+        CategoryStat.objects.filter(artwork_count__gt=0)
+        .values('category')
+        .annotate(
+            total=Sum('artwork_count'),
+            approved=status_sum('approved'),
+            pending=status_sum('pending'),
+            rejected=status_sum('rejected'),
+        )
+        .order_by('category')
+    )
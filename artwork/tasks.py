@@ -0,0 +1,15 @@
+from jobs.registry import job
+from .images import generate_renditions
+from .similarity import update_feature_vector
+from .models import Artwork
+
+
+@job
+def generate_artwork_renditions(artwork_id):
+    artwork = Artwork.objects.filter(pk=artwork_id).first()
+    if artwork is None:
+        return  # Deleted before the worker got to it
+    generate_renditions(artwork)
+    # Metadata and the similarity vector change with the image too
+    artwork.refresh_image_metadata()
+    update_feature_vector(artwork)
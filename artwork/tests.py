@@ -1,7 +1,23 @@
+import base64
+import json
+from datetime import timedelta
 import pytest
+from io import BytesIO
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.utils import timezone
+from django.utils.http import http_date
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from users.models import CustomUser
-from artwork.models import Artwork
+from artwork.dedup import ArtworkHashIndex, BKTree
+from artwork.models import Artwork, CategoryStat, Like
+from artwork.similarity import SimilarityIndex, update_feature_vector
+from artwork.stats import rebuild_category_stats
+from artwork.trending import rebuild_trending_scores, refresh_trending_scores
+from jobs.worker import run_pending
+from notifications.models import Notification
 
 @pytest.mark.django_db
 def test_create_artwork():
@@ -22,3 +38,588 @@ def test_create_artwork():
     assert response.status_code == 201
     assert Artwork.objects.count() == 1
     assert Artwork.objects.first().title == "Test Artwork"
+
+
+@pytest.mark.django_db
+def test_artwork_list_query_count_is_constant(django_assert_max_num_queries):
+    client = APIClient()
+    artist = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    fans = [
+        CustomUser.objects.create_user(email=f"fan{i}@example.com", password="password123", username=f"fan{i}")
+        for i in range(3)
+    ]
+    for i in range(5):
+        artwork = Artwork.objects.create(title=f"Artwork {i}", description="desc", image="artworks/test.jpg", artist=artist)
+        for fan in fans[:i % 3 + 1]:
+            Like.objects.create(user=fan, artwork=artwork)
+    Artwork.objects.rebuild_likes_count()
+
+    # The ETag aggregate, one COUNT for the paginator and one SELECT for the page
+    with django_assert_max_num_queries(3):
+        response = client.get("/api/artwork/")
+
+    assert response.status_code == 200
+    likes = {item["title"]: item["likes_count"] for item in response.data["results"]}
+    assert likes["Artwork 0"] == 1
+    assert likes["Artwork 4"] == 2
+
+
+@pytest.mark.django_db
+def test_like_and_unlike_maintain_likes_count():
+    client = APIClient()
+    artist = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    fan = CustomUser.objects.create_user(email="fan@example.com", password="password123", username="fan")
+    artwork = Artwork.objects.create(title="Liked", description="desc", image="artworks/test.jpg", artist=artist)
+    client.force_authenticate(user=fan)
+
+    assert client.post(f"/api/artwork/{artwork.id}/like/").status_code == 201
+    assert client.post(f"/api/artwork/{artwork.id}/like/").status_code == 400
+    artwork.refresh_from_db()
+    assert artwork.likes_count == 1
+
+    assert client.delete(f"/api/artwork/{artwork.id}/unlike/").status_code == 200
+    assert client.delete(f"/api/artwork/{artwork.id}/unlike/").status_code == 404
+    artwork.refresh_from_db()
+    assert artwork.likes_count == 0
+
+
+@pytest.mark.django_db
+def test_upload_generates_renditions(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    client = APIClient()
+    user = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    client.force_authenticate(user=user)
+
+    buffer = BytesIO()
+    Image.new("RGB", (2400, 1200), "red").save(buffer, "JPEG")
+    upload = SimpleUploadedFile("big.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+    response = client.post("/api/artwork/", {
+        "title": "Big",
+        "description": "A large upload",
+        "image": upload,
+    }, format="multipart")
+
+    assert response.status_code == 201
+    assert run_pending() == 1
+
+    artwork = Artwork.objects.get(title="Big")
+    assert set(artwork.renditions) == {"thumbnail", "medium", "large"}
+    with Image.open(artwork.image.storage.path(artwork.renditions["thumbnail"])) as thumbnail:
+        assert thumbnail.format == "WEBP"
+        assert thumbnail.size == (320, 160)
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_walks_feed_without_count(django_assert_max_num_queries):
+    client = APIClient()
+    artist = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    for i in range(5):
+        Artwork.objects.create(title=f"Artwork {i}", description="desc", image="artworks/test.jpg", artist=artist, approval_status="approved")
+    Artwork.objects.create(title="Hidden", description="desc", image="artworks/test.jpg", artist=artist)
+    # Same timestamp for every row so the id tie-breaker is exercised
+    Artwork.objects.update(submission_date=Artwork.objects.first().submission_date)
+
+    titles = []
+    url = "/api/artwork/?pagination=cursor&page_size=2&approval_status=approved"
+    while url:
+        with django_assert_max_num_queries(1):
+            response = client.get(url)
+        assert response.status_code == 200
+        assert "total_items" not in response.data
+        titles += [item["title"] for item in response.data["results"]]
+        url = response.data["next"]
+
+    assert titles == [f"Artwork {i}" for i in reversed(range(5))]
+
+
+@pytest.mark.django_db
+def test_tampered_cursor_is_not_found():
+    client = APIClient()
+    artist = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    Artwork.objects.create(title="Artwork", description="desc", image="artworks/test.jpg", artist=artist)
+
+    for values in (["garbage", 1], [None, 1], ["2025-01-01T00:00:00+00:00", "x"], [{}, 1], "not a list"):
+        cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+        response = client.get("/api/artwork/", {"pagination": "cursor", "cursor": cursor})
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_featured_artworks_cached_until_moderation():
+    client = APIClient()
+    admin = CustomUser.objects.create_user(email="admin@example.com", password="password123", username="admin", role="admin")
+    artwork = Artwork.objects.create(title="Pending", description="desc", image="artworks/test.jpg", artist=admin)
+
+    assert client.get("/api/featured-artworks/").data["results"] == []
+
+    # Served from the cache: no queries against the artwork tables
+    with CaptureQueriesContext(connection) as queries:
+        client.get("/api/featured-artworks/")
+    assert not [q for q in queries.captured_queries if "artwork_artwork" in q["sql"]]
+    # Unknown parameters share the same entry
+    with CaptureQueriesContext(connection) as queries:
+        client.get("/api/featured-artworks/", {"utm_source": "x", "nonce": "123"})
+    assert not [q for q in queries.captured_queries if "artwork_artwork" in q["sql"]]
+
+    client.force_authenticate(user=admin)
+    assert client.patch(f"/api/artwork/{artwork.id}/approve/").status_code == 200
+    client.force_authenticate(user=None)
+
+    titles = [item["title"] for item in client.get("/api/featured-artworks/").data["results"]]
+    assert titles == ["Pending"]
+
+
+@pytest.mark.django_db
+def test_artwork_stats_use_single_cached_aggregate(django_assert_num_queries):
+    client = APIClient()
+    admin = CustomUser.objects.create_user(email="admin@example.com", password="password123", username="admin", role="admin")
+    for status_value in ["pending", "pending", "approved", "rejected"]:
+        Artwork.objects.create(title=status_value, description="desc", image="artworks/test.jpg", artist=admin, approval_status=status_value)
+    client.force_authenticate(user=admin)
+
+    response = client.get("/api/artworks/stats/")
+    assert response.data == {"pending": 2, "approved": 1, "rejected": 1, "total": 4}
+
+    # Cached: only the cache lookup hits the database
+    with django_assert_num_queries(1):
+        assert client.get("/api/pending_count/").data == {"count": 2}
+
+
+@pytest.mark.django_db
+def test_has_liked_resolved_per_page_and_in_batch(django_assert_max_num_queries):
+    client = APIClient()
+    artist = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    fan = CustomUser.objects.create_user(email="fan@example.com", password="password123", username="fan")
+    artworks = [
+        Artwork.objects.create(title=f"Artwork {i}", description="desc", image="artworks/test.jpg", artist=artist)
+        for i in range(4)
+    ]
+    Like.objects.create(user=fan, artwork=artworks[1])
+    Like.objects.create(user=fan, artwork=artworks[3])
+    client.force_authenticate(user=fan)
+
+    # ETag aggregate, paginator COUNT, page SELECT and one Like lookup for the page
+    with django_assert_max_num_queries(4):
+        response = client.get("/api/artwork/")
+    liked = {item["title"]: item["has_liked"] for item in response.data["results"]}
+    assert liked == {"Artwork 0": False, "Artwork 1": True, "Artwork 2": False, "Artwork 3": True}
+
+    ids = ",".join(str(a.id) for a in artworks[:2])
+    response = client.get(f"/api/artwork/like_status/?ids={ids}")
+    assert response.data == {artworks[0].id: False, artworks[1].id: True}
+
+
+@pytest.mark.django_db
+def test_liked_artworks_paginated_in_like_order(django_assert_max_num_queries):
+    client = APIClient()
+    artist = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    fan = CustomUser.objects.create_user(email="fan@example.com", password="password123", username="fan")
+    artworks = [
+        Artwork.objects.create(title=f"Artwork {i}", description="desc", image="artworks/test.jpg", artist=artist, category="digital" if i % 2 else "sketch")
+        for i in range(4)
+    ]
+    for artwork in [artworks[2], artworks[0], artworks[3], artworks[1]]:
+        Like.objects.create(user=fan, artwork=artwork)
+    client.force_authenticate(user=fan)
+
+    with django_assert_max_num_queries(2):
+        response = client.get("/api/artworks/liked/?page_size=3")
+    assert response.data["total_items"] == 4
+    assert [item["title"] for item in response.data["results"]] == ["Artwork 1", "Artwork 3", "Artwork 0"]
+    assert all(item["has_liked"] for item in response.data["results"])
+
+    response = client.get("/api/artworks/liked/?category=sketch")
+    assert [item["title"] for item in response.data["results"]] == ["Artwork 0", "Artwork 2"]
+
+    response = client.get("/api/artworks/liked/?pagination=cursor&page_size=3")
+    response = client.get(response.data["next"])
+    assert [item["title"] for item in response.data["results"]] == ["Artwork 2"]
+
+
+def test_bk_tree_finds_hashes_within_radius():
+    tree = BKTree()
+    for i, value in enumerate([0b0000, 0b0001, 0b0111, 0b1111_0000]):
+        tree.add(value, i)
+
+    assert sorted(item for _, item in tree.search(0b0000, 1)) == [0, 1]
+    assert sorted(item for _, item in tree.search(0b0011, 1)) == [1, 2]
+    assert tree.search(0b1111_1111, 2) == []
+
+
+@pytest.mark.django_db
+def test_hash_index_holds_each_artwork_once():
+    artist = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    artwork = Artwork.objects.create(
+        title="Hashed", description="desc", image="artworks/a.jpg", artist=artist, image_hash="00000000000000ff"
+    )
+    index = ArtworkHashIndex()
+    # The upload path adds the row before the next refresh reads it again
+    index.add(artwork.id, artwork.image_hash)
+    index.refresh()
+
+    assert index.tree.search(0xff, 0) == [(0, artwork.id)]
+    assert index.find_duplicates("00000000000000ff") == [artwork.id]
+
+
+@pytest.mark.django_db
+def test_reupload_is_flagged_as_duplicate(settings, tmp_path, monkeypatch):
+    settings.MEDIA_ROOT = tmp_path
+    monkeypatch.setattr("artwork.views.hash_index", ArtworkHashIndex())
+    client = APIClient()
+    user = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    client.force_authenticate(user=user)
+
+    def upload(name, size, position):
+        image = Image.new("RGB", (400, 300), "white")
+        image.paste(Image.new("RGB", (150, 100), "blue"), position)
+        buffer = BytesIO()
+        image.resize(size).save(buffer, "JPEG")
+        return client.post("/api/artwork/", {
+            "title": name,
+            "description": "desc",
+            "image": SimpleUploadedFile(f"{name}.jpg", buffer.getvalue(), content_type="image/jpeg"),
+        }, format="multipart")
+
+    original = upload("original", (400, 300), (20, 30))
+    assert original.data["duplicate_of"] is None
+
+    # Same picture at a different size
+    assert upload("copy", (200, 150), (20, 30)).data["duplicate_of"] == original.data["id"]
+    assert upload("other", (400, 300), (230, 170)).data["duplicate_of"] is None
+
+
+@pytest.mark.django_db
+def test_bulk_moderate_reports_per_id_results():
+    client = APIClient()
+    admin = CustomUser.objects.create_user(email="admin@example.com", password="password123", username="admin", role="admin")
+    pending = [
+        Artwork.objects.create(title=f"Pending {i}", description="desc", image="artworks/test.jpg", artist=admin)
+        for i in range(3)
+    ]
+    approved = Artwork.objects.create(title="Approved", description="desc", image="artworks/test.jpg", artist=admin, approval_status="approved")
+    client.force_authenticate(user=admin)
+    rebuild_category_stats()
+
+    ids = [a.id for a in pending] + [approved.id, 999999]
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post("/api/artwork/bulk_moderate/", {"ids": ids, "decision": "approved"}, format="json")
+    # One locking SELECT, one UPDATE and one bulk INSERT, whatever the batch
+    # size, plus one rollup UPDATE per (category, status, artist) bucket touched
+    captured = [q["sql"] for q in queries.captured_queries if "django_cache" not in q["sql"] and "SAVEPOINT" not in q["sql"]]
+    assert [sql.split()[0] for sql in captured if "categorystat" not in sql] == ["SELECT", "UPDATE", "INSERT"]
+    assert [sql.split()[0] for sql in captured if "categorystat" in sql] == ["UPDATE", "UPDATE"]
+
+    assert response.status_code == 200
+    assert response.data["updated"] == 3
+    assert response.data["results"][approved.id] == "unchanged"
+    assert response.data["results"][999999] == "not_found"
+    assert Artwork.objects.filter(approval_status="approved").count() == 4
+    assert Notification.objects.filter(notification_type="artwork_approved").count() == 3
+
+    response = client.post("/api/artwork/bulk_moderate/", {"ids": ids, "decision": "rejected"}, format="json")
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_bulk_moderate_requires_admin():
+    client = APIClient()
+    member = CustomUser.objects.create_user(email="member@example.com", password="password123", username="member")
+    artwork = Artwork.objects.create(title="Pending", description="desc", image="artworks/test.jpg", artist=member)
+
+    response = client.post("/api/artwork/bulk_moderate/", {"ids": [artwork.id], "decision": "approved"}, format="json")
+    assert response.status_code in (401, 403)
+    client.force_authenticate(user=member)
+    response = client.post("/api/artwork/bulk_moderate/", {"ids": [artwork.id], "decision": "approved"}, format="json")
+    assert response.status_code == 403
+    artwork.refresh_from_db()
+    assert artwork.approval_status == "pending"
+
+
+@pytest.mark.django_db
+def test_reviewers_claim_disjoint_artworks_and_moderation_releases_lease():
+    admins = [
+        CustomUser.objects.create_user(email=f"admin{i}@example.com", password="password123", username=f"admin{i}", role="admin")
+        for i in range(2)
+    ]
+    artworks = [
+        Artwork.objects.create(title=f"Pending {i}", description="desc", image="artworks/test.jpg", artist=admins[0])
+        for i in range(3)
+    ]
+    first, second = APIClient(), APIClient()
+    first.force_authenticate(user=admins[0])
+    second.force_authenticate(user=admins[1])
+
+    claimed_first = [item["id"] for item in first.post("/api/artwork/claim/", {"count": 2}, format="json").data]
+    claimed_second = [item["id"] for item in second.post("/api/artwork/claim/", {"count": 2}, format="json").data]
+    assert claimed_first == [artworks[0].id, artworks[1].id]
+    assert claimed_second == [artworks[2].id]
+
+    assert second.patch(f"/api/artwork/{artworks[0].id}/approve/").status_code == 409
+    assert first.patch(f"/api/artwork/{artworks[0].id}/approve/").status_code == 200
+    artworks[0].refresh_from_db()
+    assert artworks[0].reviewer is None
+
+    response = first.post("/api/artwork/bulk_moderate/", {"ids": [artworks[1].id, artworks[2].id], "decision": "approved"}, format="json")
+    assert response.data["results"] == {artworks[1].id: "approved", artworks[2].id: "leased"}
+
+
+@pytest.mark.django_db
+def test_claim_requires_admin():
+    client = APIClient()
+    member = CustomUser.objects.create_user(email="member@example.com", password="password123", username="member")
+    artwork = Artwork.objects.create(title="Pending", description="desc", image="artworks/test.jpg", artist=member)
+
+    assert client.post("/api/artwork/claim/", {"count": 1}, format="json").status_code in (401, 403)
+    client.force_authenticate(user=member)
+    assert client.post("/api/artwork/claim/", {"count": 1}, format="json").status_code == 403
+    artwork.refresh_from_db()
+    assert artwork.reviewer is None
+
+
+@pytest.mark.django_db
+def test_artwork_list_is_not_revalidated_by_date_alone():
+    client = APIClient()
+    artist = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    artworks = [
+        Artwork.objects.create(title=f"Artwork {i}", description="desc", image="artworks/test.jpg", artist=artist)
+        for i in range(2)
+    ]
+    response = client.get("/api/artwork/")
+    assert "Last-Modified" not in response
+
+    # Deleting a row leaves MAX(updated_at) alone, so a date can't validate the list
+    artworks[0].delete()
+    since = http_date(timezone.now().timestamp() + 60)
+    response = client.get("/api/artwork/", HTTP_IF_MODIFIED_SINCE=since)
+    assert response.status_code == 200
+    assert response.data["total_items"] == 1
+
+    # Detail reads keep Last-Modified for anonymous callers only
+    assert "Last-Modified" in client.get(f"/api/artwork/{artworks[1].id}/")
+    client.force_authenticate(user=artist)
+    assert "Last-Modified" not in client.get(f"/api/artwork/{artworks[1].id}/")
+
+
+@pytest.mark.django_db
+def test_artwork_list_honours_if_none_match():
+    client = APIClient()
+    artist = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    artwork = Artwork.objects.create(title="Artwork", description="desc", image="artworks/test.jpg", artist=artist)
+
+    response = client.get("/api/artwork/")
+    etag = response["ETag"]
+    assert client.get("/api/artwork/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    detail = client.get(f"/api/artwork/{artwork.id}/")
+    assert client.get(f"/api/artwork/{artwork.id}/", HTTP_IF_NONE_MATCH=detail["ETag"]).status_code == 304
+
+    artwork.title = "Renamed"
+    artwork.save()
+    assert client.get("/api/artwork/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+    assert client.get(f"/api/artwork/{artwork.id}/", HTTP_IF_NONE_MATCH=detail["ETag"]).status_code == 200
+
+
+@pytest.mark.django_db
+def test_export_streams_filtered_artworks():
+    client = APIClient()
+    admin = CustomUser.objects.create_user(email="admin@example.com", password="password123", username="admin", role="admin")
+    for i in range(3):
+        Artwork.objects.create(title=f"Artwork {i}", description="desc", image="artworks/test.jpg", artist=admin, category="digital" if i else "sketch")
+
+    assert client.get("/api/artwork/export/").status_code in (401, 403)
+    client.force_authenticate(user=admin)
+
+    response = client.get("/api/artwork/export/?category=digital")
+    assert response.streaming
+    rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+    assert [row["title"] for row in rows] == ["Artwork 1", "Artwork 2"]
+    assert rows[0]["artist_email"] == "admin@example.com"
+
+    response = client.get("/api/artwork/export/?export_format=csv")
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert lines[0].startswith("id,title,description")
+    assert len(lines) == 4
+
+
+@pytest.mark.django_db
+def test_image_metadata_is_extracted_in_background(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    client = APIClient()
+    artist = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    client.force_authenticate(user=artist)
+
+    buffer = BytesIO()
+    image = Image.new("RGB", (300, 200), (20, 40, 200))
+    image.paste((250, 250, 250), (0, 0, 60, 40))
+    image.save(buffer, format="JPEG")
+    upload = SimpleUploadedFile("blue.jpg", buffer.getvalue(), content_type="image/jpeg")
+    response = client.post("/api/artwork/", {"title": "Blue", "description": "desc", "image": upload}, format="multipart")
+    assert response.status_code == 201
+    assert response.data["image_width"] is None
+
+    run_pending()
+
+    artwork = Artwork.objects.get(pk=response.data["id"])
+    assert (artwork.image_width, artwork.image_height) == (300, 200)
+    assert artwork.aspect_ratio == 1.5
+    assert artwork.file_size == len(buffer.getvalue())
+    assert artwork.color_family == "blue"
+    assert len(artwork.dominant_colors) <= 5
+
+    response = client.get("/api/artwork/", {"color_family": "blue"})
+    assert [item["id"] for item in response.data["results"]] == [artwork.pk]
+    assert client.get("/api/artwork/", {"color_family": "red"}).data["results"] == []
+
+
+@pytest.mark.django_db
+def test_similar_artworks_ranks_by_colour_and_layout(settings, tmp_path, monkeypatch):
+    index = SimilarityIndex()
+    monkeypatch.setattr("artwork.similarity.similarity_index", index)
+    monkeypatch.setattr("artwork.views.similarity_index", index)
+    settings.MEDIA_ROOT = str(tmp_path)
+    artist = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+
+    def make(title, colour, status="approved"):
+        buffer = BytesIO()
+        Image.new("RGB", (120, 90), colour).save(buffer, format="PNG")
+        artwork = Artwork.objects.create(
+            title=title, description="desc", artist=artist, approval_status=status,
+            image=SimpleUploadedFile(f"{title}.png", buffer.getvalue(), content_type="image/png"),
+        )
+        update_feature_vector(artwork)
+        return artwork
+
+    source = make("red", (220, 20, 20))
+    close = make("darker-red", (190, 30, 25))
+    far = make("blue", (20, 40, 220))
+    make("pending-red", (215, 25, 20), status="pending")
+
+    response = APIClient().get(f"/api/artwork/{source.id}/similar/", {"limit": 5})
+    assert response.status_code == 200
+    assert [item["id"] for item in response.data] == [close.id, far.id]
+    assert response.data[0]["similarity"] > response.data[1]["similarity"]
+
+
+@pytest.mark.django_db
+def test_trending_scores_favour_recent_likes_and_refresh_incrementally():
+    artist = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    fans = [
+        CustomUser.objects.create_user(email=f"fan{i}@example.com", password="password123", username=f"fan{i}")
+        for i in range(3)
+    ]
+    old = Artwork.objects.create(title="Old", description="desc", image="artworks/old.jpg", artist=artist, approval_status="approved")
+    fresh = Artwork.objects.create(title="Fresh", description="desc", image="artworks/fresh.jpg", artist=artist, approval_status="approved")
+    now = timezone.now()
+    for fan in fans:
+        Like.objects.create(user=fan, artwork=old)
+    for fan in fans[:2]:
+        Like.objects.create(user=fan, artwork=fresh)
+    Like.objects.filter(artwork=old).update(created_at=now - timedelta(days=10))
+    Like.objects.filter(artwork=fresh).update(created_at=now - timedelta(hours=2))
+
+    assert refresh_trending_scores() == 5
+    assert refresh_trending_scores() == 0
+    old.refresh_from_db()
+    fresh.refresh_from_db()
+    assert fresh.trending_score > old.trending_score
+
+    # Likes still inside the settle window wait for the next run
+    Like.objects.create(user=fans[2], artwork=fresh)
+    assert refresh_trending_scores() == 0
+
+    response = APIClient().get("/api/artwork/", {"ordering": "-trending_score"})
+    assert [item["title"] for item in response.data["results"]] == ["Fresh", "Old"]
+
+    before = fresh.trending_score
+    rebuild_trending_scores()
+    fresh.refresh_from_db()
+    assert fresh.trending_score > before
+
+
+
+@pytest.mark.django_db
+def test_category_rollup_follows_create_moderation_and_delete(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    client = APIClient()
+    admin = CustomUser.objects.create_user(email="admin@example.com", password="password123", username="admin", role="admin")
+    client.force_authenticate(user=admin)
+
+    def upload(title, category):
+        buffer = BytesIO()
+        Image.new("RGB", (32, 32), "white").save(buffer, format="PNG")
+        image = SimpleUploadedFile(f"{title}.png", buffer.getvalue(), content_type="image/png")
+        response = client.post("/api/artwork/", {"title": title, "description": "d", "category": category, "image": image}, format="multipart")
+        assert response.status_code == 201
+        return response.data["id"]
+
+    sketches = [upload(f"sketch{i}", "sketch") for i in range(3)]
+    photo = upload("photo", "photography")
+    assert client.patch(f"/api/artwork/{sketches[0]}/approve/").status_code == 200
+    assert client.post("/api/artwork/bulk_moderate/", {"ids": sketches[1:], "decision": "rejected", "feedback": "No"}, format="json").status_code == 200
+    assert client.delete(f"/api/artwork/{photo}/").status_code == 204
+
+    response = client.get("/api/artwork/category_analytics/")
+    assert list(response.data) == [
+        {"category": "sketch", "total": 3, "approved": 1, "pending": 0, "rejected": 2},
+    ]
+    member_stats = client.get("/api/users/member-stats/").data
+    assert member_stats["category_distribution"] == [{"category": "sketch", "count": 3}]
+
+    live = list(response.data)
+    rebuild_category_stats()
+    assert list(client.get("/api/artwork/category_analytics/").data) == live
+
+
+@pytest.mark.django_db
+def test_category_rollup_follows_direct_orm_writes():
+    artist = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+
+    def count(category, status):
+        stat = CategoryStat.objects.filter(category=category, approval_status=status, artist=artist).first()
+        return stat.artwork_count if stat else 0
+
+    # As the admin site would: plain create, edit and delete
+    artworks = [
+        Artwork.objects.create(title=f"Sketch {i}", description="desc", image="artworks/test.jpg", artist=artist)
+        for i in range(2)
+    ]
+    assert count("sketch", "pending") == 2
+
+    artworks[0].category = "canvas"
+    artworks[0].approval_status = "approved"
+    artworks[0].save()
+    assert (count("sketch", "pending"), count("canvas", "approved")) == (1, 1)
+
+    # Saves that name unrelated fields leave the rollup alone
+    artworks[1].category = "digital"
+    artworks[1].save(update_fields=["likes_count"])
+    assert count("sketch", "pending") == 1
+
+    artworks[1].refresh_from_db()
+    artworks[1].delete()
+    assert count("sketch", "pending") == 0
+    Artwork.objects.filter(pk=artworks[0].pk).delete()
+    assert count("canvas", "approved") == 0
+
+
+@pytest.mark.django_db
+def test_counter_ordering_breaks_ties_on_id():
+    client = APIClient()
+    artist = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    artworks = [
+        Artwork.objects.create(title=f"Artwork {i}", description="desc", image="artworks/test.jpg", artist=artist)
+        for i in range(5)
+    ]
+    Artwork.objects.filter(pk=artworks[2].pk).update(trending_score=1.5, likes_count=1)
+
+    for field in ("trending_score", "likes_count"):
+        pages = [
+            [item["id"] for item in client.get("/api/artwork/", {"ordering": f"-{field}", "page": page, "page_size": 2}).data["results"]]
+            for page in (1, 2, 3)
+        ]
+        expected = [artworks[2].id] + sorted((a.id for a in artworks if a is not artworks[2]), reverse=True)
+        assert sum(pages, []) == expected
+
+    response = client.get("/api/artwork/", {"pagination": "cursor", "ordering": "-trending_score"})
+    assert response.status_code == 400
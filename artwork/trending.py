@@ -0,0 +1,98 @@
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models.functions import Now
+from django.utils import timezone
+
+from .models import Artwork, Like, TrendingWatermark
+
+# A like counts half as much after each half-life
+TRENDING_HALF_LIFE = timedelta(days=3)
+TRENDING_EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+# Likes younger than this wait for the next run, so rows from transactions
+# still in flight (lower id, later commit) are not jumped over
+SETTLE_DELAY = timedelta(minutes=1)
+BATCH_SIZE = 1000
+
+DECAY_SECONDS = TRENDING_HALF_LIFE.total_seconds() / math.log(2)
+
+
+def like_weight(created_at):
+    """
+    Log-weight of one like. trending_score is the log of the sum of
+    exp(weight) over an artwork's likes: the decayed like count scaled by a
+    factor common to every artwork, so it orders the same at any moment and
+    never needs re-decaying. Working in logs keeps it from overflowing.
+    """
+    return (created_at - TRENDING_EPOCH).total_seconds() / DECAY_SECONDS
+
+
+def logaddexp(a, b):
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+def _update_scores(scores, replace=False):
+    ids = list(scores)
+    now = timezone.now()
+    for start in range(0, len(ids), BATCH_SIZE):
+        artworks = list(Artwork.objects.filter(id__in=ids[start:start + BATCH_SIZE]).only('id', 'trending_score'))
+        for artwork in artworks:
+            score = scores[artwork.pk]
+            artwork.trending_score = score if replace else logaddexp(artwork.trending_score, score)
+            # Trending lists are cached by ETag, which keys on updated_at
+            artwork.updated_at = now
+        Artwork.objects.bulk_update(artworks, ['trending_score', 'updated_at'])
+
+
+def refresh_trending_scores():
+    """Fold likes added since the last run into trending_score. Returns the number of likes read."""
+    cutoff = timezone.now() - SETTLE_DELAY
+    with transaction.atomic():
+        watermark, _ = TrendingWatermark.objects.select_for_update().get_or_create(pk=1)
+        likes = (
+            Like.objects.filter(id__gt=watermark.last_like_id)
+            .order_by('id')
+            .values_list('id', 'artwork_id', 'created_at')
+        )
+
+        scores = {}
+        read = 0
+        last_id = watermark.last_like_id
+        for like_id, artwork_id, created_at in likes.iterator(chunk_size=BATCH_SIZE):
+            if created_at >= cutoff:
+                break
+            weight = like_weight(created_at)
+            scores[artwork_id] = logaddexp(scores[artwork_id], weight) if artwork_id in scores else weight
+            last_id = like_id
+            read += 1
+
+        _update_scores(scores)
+        watermark.last_like_id = last_id
+        watermark.refreshed_at = timezone.now()
+        watermark.save()
+    return read
+
+
+def rebuild_trending_scores():
+    """
+    Recompute every score from the full Like table. Refreshes only add
+    likes, so run this now and then to drop likes that were since removed.
+    """
+    with transaction.atomic():
+        watermark, _ = TrendingWatermark.objects.select_for_update().get_or_create(pk=1)
+        last_id = Like.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+        scores = {}
+        likes = Like.objects.filter(id__lte=last_id).values_list('artwork_id', 'created_at')
+        for artwork_id, created_at in likes.iterator(chunk_size=BATCH_SIZE):
+            weight = like_weight(created_at)
+            scores[artwork_id] = logaddexp(scores[artwork_id], weight) if artwork_id in scores else weight
+
+        Artwork.objects.exclude(trending_score=0).update(trending_score=0, updated_at=Now())
+        _update_scores(scores, replace=True)
+        watermark.last_like_id = last_id
+        watermark.refreshed_at = timezone.now()
+        watermark.save()
+    return len(scores)
@@ -1,56 +1,142 @@
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from users.pagination import CustomPagination
+from users.filters import FullTextSearchFilter, StableOrderingFilter
+from users.conditional import ConditionalGetMixin
+from users.exports import stream_export, get_export_format
 from notifications.models import Notification
-from rest_framework import viewsets, filters
+from rest_framework import viewsets
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Artwork, Like
-from .serializers import ArtworkSerializer
+from .serializers import ArtworkSerializer, get_liked_artwork_ids
+from .cache import get_featured_artworks, invalidate_featured_artworks
+from .dedup import hash_index
+from .images import delete_renditions, perceptual_hash
+from .similarity import load_vector, similarity_index
+from .stats import (
+    apply_category_stat_changes, get_category_analytics, get_status_counts, invalidate_status_counts,
+)
+from .tasks import generate_artwork_renditions
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
+from rest_framework.generics import ListAPIView
 from users.permissions import IsAdminUser
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework import status
-from django.db import models
-from django.db.models import Count
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Now
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from collections import Counter
+from datetime import timedelta
 from rest_framework.permissions import AllowAny
+import logging
 
-class ArtworkViewSet(viewsets.ModelViewSet):
+logger = logging.getLogger(__name__)
+
+class ArtworkViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Artwork.objects.all()#.order_by("-submission_date")
     serializer_class = ArtworkSerializer
     parser_classes = (MultiPartParser, FormParser, JSONParser)  # ✅ Allow file uploads
     pagination_class = CustomPagination  # Use the custom pagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, StableOrderingFilter]
     
     
     # Enable filtering by approval status and artist
-    filterset_fields = ['approval_status', 'artist', 'category']
+    filterset_fields = ['approval_status', 'artist', 'category', 'color_family']
     
     # Enable search by title or description
     search_fields = ['title', 'description']
     
-    # Enable ordering by submission date
-    ordering_fields = ['submission_date']
+    # Enable ordering by submission date, popularity and ?ordering=-trending_score.
+    # Ties are broken on id; ?pagination=cursor keeps its own order and rejects ?ordering=
+    ordering_fields = ['submission_date', 'likes_count', 'trending_score']
+
+    # Key used by ?pagination=cursor
+    cursor_ordering = ('-submission_date', '-id')
+
+    like_status_max_ids = 100
+    bulk_moderate_max_ids = 500
+    claim_max_count = 50
+    similar_default_limit = 12
+    similar_max_limit = 50
+
+    export_columns = [
+        ('id', 'id'),
+        ('title', 'title'),
+        ('description', 'description'),
+        ('category', 'category'),
+        ('approval_status', 'approval_status'),
+        ('feedback', 'feedback'),
+        ('artist_id', 'artist_id'),
+        ('artist_email', 'artist__email'),
+        ('likes_count', 'likes_count'),
+        ('image', 'image'),
+        ('submission_date', 'submission_date'),
+        ('updated_at', 'updated_at'),
+    ]
+    review_lease = timedelta(minutes=15)
+
+
+    def get_queryset(self):
+        return Artwork.objects.with_list_data()
 
 
     def get_permissions(self):
-        if self.action in ['update', 'partial_update', 'destroy']:
+        # Moderation writes are admin-only whatever the @action declares
+        if self.action in ['update', 'partial_update', 'destroy', 'bulk_moderate', 'claim']:
             print(f"Permissions checked for admin user: {self.request.user.is_staff}")  # ✅ Debugging log
             permission_classes = [IsAuthenticated, IsAdminUser]
          
         else:
-            permission_classes = [AllowAny]
+            # Default AllowAny, or whatever an @action declared
+            permission_classes = self.permission_classes
         return [permission() for permission in permission_classes]
 
     
+    def hash_upload(self, image, artwork_id=None):
+        # Returns (hash, id of the closest existing look-alike or None)
+        try:
+            image_hash = perceptual_hash(image)
+        except Exception:
+            logger.warning("Could not hash uploaded image", exc_info=True)
+            return "", None
+        duplicates = hash_index.find_duplicates(image_hash, exclude_id=artwork_id)
+        return image_hash, duplicates[0] if duplicates else None
+
+
     def perform_create(self, serializer):
-        serializer.save(artist=self.request.user)
+        image_hash, duplicate_of = self.hash_upload(serializer.validated_data['image'])
+        instance = serializer.save(artist=self.request.user, image_hash=image_hash, duplicate_of_id=duplicate_of)
+        if image_hash:
+            hash_index.add(instance.pk, image_hash)
+        invalidate_status_counts()
+        generate_artwork_renditions.enqueue(artwork_id=instance.pk)
 
 
     def perform_update(self, serializer):
         print("Updating Artwork with Data:", serializer.validated_data)  # ✅ Debugging log
-        instance = serializer.save()
+        old_status = serializer.instance.approval_status
+        was_approved = old_status == 'approved'
+
+        extra = {}
+        if 'image' in serializer.validated_data:
+            image_hash, duplicate_of = self.hash_upload(serializer.validated_data['image'], serializer.instance.pk)
+            extra = {'image_hash': image_hash, 'duplicate_of_id': duplicate_of}
+        instance = serializer.save(**extra)
+        if extra.get('image_hash'):
+            hash_index.add(instance.pk, instance.image_hash)
+
+        if instance.approval_status != old_status:
+            invalidate_status_counts()
+
+        if was_approved or instance.approval_status == 'approved':
+            invalidate_featured_artworks()
+
+        if 'image' in serializer.validated_data:
+            generate_artwork_renditions.enqueue(artwork_id=instance.pk)
         
         if instance.approval_status == 'rejected' and 'feedback' in serializer.validated_data:
             Notification.objects.create(
@@ -67,12 +153,27 @@ class ArtworkViewSet(viewsets.ModelViewSet):
             )
 
 
+    def perform_destroy(self, instance):
+        was_approved = instance.approval_status == 'approved'
+        delete_renditions(instance)
+        instance.delete()
+        invalidate_status_counts()
+        if was_approved:
+            invalidate_featured_artworks()
+
+
 
     @action(detail=True, methods=['patch'], permission_classes=[IsAuthenticated, IsAdminUser])
     def approve(self, request, pk=None):
         artwork = self.get_object()
+        if artwork.is_leased_to_other(request.user):
+            return Response({"error": "Another reviewer is working on this artwork."}, status=status.HTTP_409_CONFLICT)
+
         artwork.approval_status = 'approved'
+        artwork.release_review_lease()
         artwork.save()
+        invalidate_featured_artworks()
+        invalidate_status_counts()
 
         # Send Notification
         Notification.objects.create(
@@ -88,6 +189,9 @@ class ArtworkViewSet(viewsets.ModelViewSet):
         artwork = self.get_object()
         feedback = request.data.get("feedback", "")
 
+        if artwork.is_leased_to_other(request.user):
+            return Response({"error": "Another reviewer is working on this artwork."}, status=status.HTTP_409_CONFLICT)
+
         print("Feedback received for rejection:", feedback)  # Debugging log
 
         if not feedback.strip():
@@ -96,9 +200,14 @@ class ArtworkViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        was_approved = artwork.approval_status == 'approved'
         artwork.approval_status = 'rejected'
         artwork.feedback = feedback  # Save the feedback
+        artwork.release_review_lease()
         artwork.save()
+        invalidate_status_counts()
+        if was_approved:
+            invalidate_featured_artworks()
 
         print("Artwork feedback saved:", artwork.feedback)  # Debugging log
 
@@ -110,6 +219,119 @@ class ArtworkViewSet(viewsets.ModelViewSet):
         return Response({"message": "Artwork rejected successfully."}, status=status.HTTP_200_OK)
 
 
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated, IsAdminUser])
+    def bulk_moderate(self, request):
+        """Approve or reject many artworks at once: {"ids": [...], "decision": "approved"|"rejected", "feedback": "..."}"""
+        ids = request.data.get("ids")
+        decision = request.data.get("decision")
+        feedback = request.data.get("feedback", "")
+
+        if not isinstance(ids, list) or not ids or not all(isinstance(i, int) for i in ids):
+            return Response({"error": "ids must be a non-empty list of integers."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.bulk_moderate_max_ids:
+            return Response({"error": f"At most {self.bulk_moderate_max_ids} ids per request."}, status=status.HTTP_400_BAD_REQUEST)
+        if decision not in ("approved", "rejected"):
+            return Response({"error": "decision must be 'approved' or 'rejected'."}, status=status.HTTP_400_BAD_REQUEST)
+        if decision == "rejected" and not feedback.strip():
+            return Response({"error": "Feedback is required when rejecting an artwork."}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            # Lock the rows so the per-id results match what the UPDATE changed
+            rows = {
+                row["id"]: row
+                for row in Artwork.objects.select_for_update()
+                .filter(id__in=ids)
+                .values("id", "title", "artist_id", "category", "approval_status", "reviewer_id", "review_lease_expires_at")
+            }
+            now = timezone.now()
+            leased = {
+                row["id"] for row in rows.values()
+                if row["reviewer_id"] not in (None, request.user.pk)
+                and row["review_lease_expires_at"] and row["review_lease_expires_at"] > now
+            }
+            changed = [row for row in rows.values() if row["approval_status"] != decision and row["id"] not in leased]
+
+            fields = {"approval_status": decision, "reviewer": None, "review_lease_expires_at": None}
+            if decision == "rejected":
+                fields["feedback"] = feedback
+            Artwork.objects.filter(id__in=[row["id"] for row in changed]).exclude(approval_status=decision).update(updated_at=Now(), **fields)
+
+            stat_changes = Counter()
+            for row in changed:
+                stat_changes[(row["category"], row["approval_status"], row["artist_id"])] -= 1
+                stat_changes[(row["category"], decision, row["artist_id"])] += 1
+            apply_category_stat_changes(stat_changes)
+
+            if decision == "approved":
+                notifications = [
+                    Notification(
+                        recipient_id=row["artist_id"],
+                        message=f"Your artwork '{row['title']}' has been approved.",
+                        notification_type='artwork_approved'
+                    ) for row in changed
+                ]
+            else:
+                notifications = [
+                    Notification(
+                        recipient_id=row["artist_id"],
+                        message=f"Your artwork '{row['title']}' has been rejected. Feedback: {feedback}",
+                        notification_type='artwork_rejected'
+                    ) for row in changed
+                ]
+            Notification.objects.bulk_create(notifications)
+
+        if changed:
+            invalidate_status_counts()
+        if any(decision == "approved" or row["approval_status"] == "approved" for row in changed):
+            invalidate_featured_artworks()
+
+        changed_ids = {row["id"] for row in changed}
+        results = {}
+        for artwork_id in ids:
+            if artwork_id in changed_ids:
+                results[artwork_id] = decision
+            elif artwork_id in leased:
+                results[artwork_id] = "leased"
+            elif artwork_id in rows:
+                results[artwork_id] = "unchanged"
+            else:
+                results[artwork_id] = "not_found"
+        return Response({"updated": len(changed), "results": results}, status=status.HTTP_200_OK)
+
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated, IsAdminUser])
+    def claim(self, request):
+        """Lease the next {"count": N} pending artworks to the current reviewer"""
+        try:
+            count = min(max(int(request.data.get("count", 10)), 1), self.claim_max_count)
+        except (TypeError, ValueError):
+            return Response({"error": "count must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        now = timezone.now()
+        with transaction.atomic():
+            # SKIP LOCKED lets concurrent reviewers claim disjoint rows without waiting
+            ids = list(
+                Artwork.objects.select_for_update(skip_locked=True)
+                .filter(approval_status='pending')
+                .filter(
+                    models.Q(reviewer__isnull=True)
+                    | models.Q(review_lease_expires_at__lt=now)
+                    | models.Q(reviewer=request.user)
+                )
+                .order_by('submission_date', 'id')
+                .values_list('id', flat=True)[:count]
+            )
+            Artwork.objects.filter(id__in=ids).update(
+                reviewer=request.user,
+                review_lease_expires_at=now + self.review_lease,
+                updated_at=now,
+            )
+
+        artworks = self.get_queryset().filter(id__in=ids).order_by('submission_date', 'id')
+        serializer = self.get_serializer(artworks, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_artworks(self, request):
         queryset = self.filter_queryset(self.get_queryset().filter(artist=request.user))
@@ -122,19 +344,67 @@ class ArtworkViewSet(viewsets.ModelViewSet):
     
     
     
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def like_status(self, request):
+        """Which of ?ids=1,2,3 the current user has liked, as {id: bool}"""
+        try:
+            ids = [int(i) for i in request.query_params.get('ids', '').split(',') if i.strip()]
+        except ValueError:
+            return Response({"error": "ids must be a comma-separated list of integers."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.like_status_max_ids:
+            return Response({"error": f"At most {self.like_status_max_ids} ids per request."}, status=status.HTTP_400_BAD_REQUEST)
+
+        liked_ids = get_liked_artwork_ids(request.user, ids)
+        return Response({artwork_id: artwork_id in liked_ids for artwork_id in ids})
+    
+    
+    
+    @action(detail=True, methods=['get'], permission_classes=[AllowAny])
+    def similar(self, request, pk=None):
+        """Approved artworks that look most like this one (?limit=, default 12)"""
+        try:
+            limit = min(max(int(request.query_params.get('limit', self.similar_default_limit)), 1), self.similar_max_limit)
+        except ValueError:
+            return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        artwork = self.get_object()
+        vector = similarity_index.vector_for(artwork.pk)
+        if vector is None:
+            stored = Artwork.objects.filter(pk=artwork.pk).values_list('feature_vector', flat=True).first()
+            if stored is None:
+                # Vectors are computed by the renditions job after upload
+                return Response([])
+            vector = load_vector(stored)
+
+        # Over-fetch a little: the index can still hold rows deleted or
+        # un-approved since its last sync
+        matches = similarity_index.search(vector, limit + 10, exclude_id=artwork.pk)
+        scores = dict(matches)
+        artworks = Artwork.objects.with_list_data().filter(id__in=scores, approval_status='approved').in_bulk()
+        ordered = [artworks[artwork_id] for artwork_id, _ in matches if artwork_id in artworks][:limit]
+
+        data = self.get_serializer(ordered, many=True).data
+        for item in data:
+            item['similarity'] = round(scores[item['id']], 4)
+        return Response(data)
+    
+    
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated, IsAdminUser])
+    def export(self, request):
+        """Stream every artwork matching the usual filters as NDJSON or CSV"""
+        export_format = get_export_format(request)
+        if export_format is None:
+            return Response({"error": "export_format must be 'ndjson' or 'csv'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.filter_queryset(Artwork.objects.all()).order_by('id')
+        return stream_export(queryset, self.export_columns, export_format, "artworks")
+    
+    
+    
     @action(detail=False, methods=["get"], permission_classes=[IsAdminUser])
     def category_analytics(self, request):
-        analytics = (
-            Artwork.objects.values("category")
-            .annotate(
-                total=Count("id"),
-                approved=Count("id", filter=models.Q(approval_status="approved")),
-                pending=Count("id", filter=models.Q(approval_status="pending")),
-                rejected=Count("id", filter=models.Q(approval_status="rejected")),
-            )
-            .order_by("category")
-        )
-        return Response(analytics, status=200)
+        return Response(get_category_analytics(), status=200)
     
     
     
@@ -142,8 +412,12 @@ class ArtworkViewSet(viewsets.ModelViewSet):
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def like_artwork(request, artwork_id):
-    artwork = Artwork.objects.get(id=artwork_id)
-    like, created = Like.objects.get_or_create(user=request.user, artwork=artwork)
+    artwork = get_object_or_404(Artwork, id=artwork_id)
+    with transaction.atomic():
+        like, created = Like.objects.get_or_create(user=request.user, artwork=artwork)
+        if created:
+            # Bump the stored counter in SQL so concurrent likes don't lose updates
+            Artwork.objects.filter(pk=artwork.pk).update(likes_count=F("likes_count") + 1, updated_at=Now())
     if created:
         return Response({"message": "Artwork liked!"}, status=201)
     return Response({"message": "Already liked!"}, status=400)
@@ -151,45 +425,73 @@ def like_artwork(request, artwork_id):
 @api_view(["DELETE"])
 @permission_classes([IsAuthenticated])
 def unlike_artwork(request, artwork_id):
-    try:
-        like = Like.objects.get(user=request.user, artwork_id=artwork_id)
-        like.delete()
+    with transaction.atomic():
+        deleted, _ = Like.objects.filter(user=request.user, artwork_id=artwork_id).delete()
+        if deleted:
+            Artwork.objects.filter(pk=artwork_id, likes_count__gt=0).update(likes_count=F("likes_count") - 1, updated_at=Now())
+    if deleted:
         return Response({"message": "Like removed!"}, status=200)
-    except Like.DoesNotExist:
-        return Response({"message": "Like not found"}, status=404)
+    return Response({"message": "Like not found"}, status=404)
 
 @api_view(["GET"])
 def get_likes_count(request, artwork_id):
-    count = Like.objects.filter(artwork_id=artwork_id).count()
+    count = Artwork.objects.filter(id=artwork_id).values_list("likes_count", flat=True).first() or 0
     return Response({"likes": count})
 
-class LikedArtworksView(APIView):
+class LikedArtworksView(ListAPIView):
+    serializer_class = ArtworkSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CustomPagination
+    filter_backends = [DjangoFilterBackend]
 
-    def get(self, request):
-        user = request.user
-        
-        # ✅ Get all artwork IDs liked by the user
-        liked_artwork_ids = Like.objects.filter(user=user).values_list("artwork_id", flat=True)
+    # Same filters as ArtworkViewSet
+    filterset_fields = ['approval_status', 'category']
 
-        # ✅ Get the actual artwork objects
-        liked_artworks = Artwork.objects.filter(id__in=liked_artwork_ids)
+    # Most recently liked first; also the key used by ?pagination=cursor
+    cursor_ordering = ('-liked_at', '-id')
+
+    def get_queryset(self):
+        # Join Like to Artwork once, carrying the like time along for ordering
+        return (
+            Artwork.objects.with_list_data()
+            .filter(likes__user=self.request.user)
+            .annotate(liked_at=F('likes__created_at'))
+            .order_by(*self.cursor_ordering)
+        )
 
-        serializer = ArtworkSerializer(liked_artworks, many=True)
-        return Response(serializer.data, status=200)
+    def get_serializer(self, *args, **kwargs):
+        if kwargs.get('many'):
+            # Everything on this page is liked by definition
+            kwargs['context'] = self.get_serializer_context()
+            kwargs['context']['liked_artwork_ids'] = {artwork.pk for artwork in args[0]}
+        return super().get_serializer(*args, **kwargs)
     
     
 class FeaturedArtworkViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Artwork.objects.filter(approval_status="approved").order_by("-submission_date")[:11]  # Get latest 10 featured artworks
+    queryset = Artwork.objects.with_list_data().filter(approval_status="approved").order_by("-submission_date")[:11]  # Get latest 10 featured artworks
     serializer_class = ArtworkSerializer
     permission_classes = [AllowAny]  # Adjust as needed
+
+    def list(self, request, *args, **kwargs):
+        # Same payload for every visitor, so serve it from the cache
+        data = get_featured_artworks(
+            request,
+            lambda: super(FeaturedArtworkViewSet, self).list(request, *args, **kwargs).data,
+        )
+
+        # has_liked depends on the visitor, so it's filled in after the cache
+        results = data['results'] if isinstance(data, dict) else data
+        liked_ids = get_liked_artwork_ids(request.user, [item['id'] for item in results])
+        results = [dict(item, has_liked=item['id'] in liked_ids) for item in results]
+        if isinstance(data, dict):
+            return Response(dict(data, results=results))
+        return Response(results)
     
     
     
 class PendingArtworkCountView(APIView):
     def get(self, request):
-        count = Artwork.objects.filter(approval_status='pending').count()
-        return Response({"count": count})
+        return Response({"count": get_status_counts()['pending']})
     
     
     
@@ -197,10 +499,4 @@ class ArtworkStatsView(APIView):
     permission_classes = [IsAdminUser]  # Restrict to admin users, adjust as needed
 
     def get(self, request):
-        stats = {
-            'pending': Artwork.objects.filter(approval_status='pending').count(),
-            'approved': Artwork.objects.filter(approval_status='approved').count(),
-            'rejected': Artwork.objects.filter(approval_status='rejected').count(),
-            'total': Artwork.objects.count(),
-        }
-        return Response(stats, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(get_status_counts(), status=status.HTTP_200_OK)
\ No newline at end of file
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.5 on 2026-10-16 22:42
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+from users.search import build_search_vector
+
+
+def backfill_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Event = apps.get_model('events', 'Event')
+    Event.objects.update(search_vector=build_search_vector([('title', 'A'), ('description', 'B'), ('location', 'C')]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_eventimage_delete_eventgalleryimage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='event_search_idx'),
+        ),
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+    ]
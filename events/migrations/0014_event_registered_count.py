@@ -0,0 +1,52 @@
+# Generated by Django 5.1.5 on 2026-10-16 23:02
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def dedupe_and_count_registrations(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    EventRegistration = apps.get_model('events', 'EventRegistration')
+
+    # Keep the earliest row of any duplicate (user, event) pair so the
+    # unique constraint can be added
+    duplicates = (
+        EventRegistration.objects.values('user', 'event')
+        .annotate(first_id=Min('id'), rows=Count('id'))
+        .filter(rows__gt=1)
+        .order_by()
+    )
+    for row in duplicates:
+        EventRegistration.objects.filter(user=row['user'], event=row['event']).exclude(id=row['first_id']).delete()
+
+    counts = (
+        EventRegistration.objects.filter(event=OuterRef('pk'))
+        .order_by()
+        .values('event')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    Event.objects.update(registered_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0013_eventimage_image_metadata'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='registered_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(dedupe_and_count_registrations, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='eventregistration',
+            constraint=models.UniqueConstraint(fields=('user', 'event'), name='event_registration_unique'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-16 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0015_event_waitlist'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='cover_thumbnail',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+    ]
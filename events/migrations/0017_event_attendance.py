@@ -0,0 +1,23 @@
+# Generated by Django 5.1.5 on 2026-10-16 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0016_event_cover_thumbnail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='attended_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='eventregistration',
+            name='attended',
+            field=models.BooleanField(default=False),
+        ),
+    ]
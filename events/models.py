@@ -1,34 +1,106 @@
+import os
+
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from users.models import CustomUser  # ✅ Import your User model
+from django.db.models.functions import Now
+from users.image_metadata import ImageMetadataModel
+from users.search import SearchVectorMixin
+
+def _count_subquery(queryset):
+    # Correlated COUNT, so several counts don't multiply each other's joins
+    return Coalesce(Subquery(
+        queryset.order_by().values('event').annotate(total=Count('pk')).values('total')
+    ), 0)
+
+
+class EventQuerySet(models.QuerySet):
+    def with_list_data(self):
+        """Counts shown on event cards, without loading the attendees or gallery."""
+        return self.annotate(
+            attendee_count=_count_subquery(Event.attendees.through.objects.filter(event=OuterRef('pk'))),
+            gallery_count=_count_subquery(EventImage.objects.filter(event=OuterRef('pk'))),
+        ).defer('search_vector')
 
-class Event(models.Model):
+
+class Event(SearchVectorMixin, models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
     location = models.CharField(max_length=255)
     date = models.DateField()
     event_cover = models.ImageField(upload_to="event_covers/", null=True, blank=True)
+    cover_thumbnail = models.CharField(max_length=255, blank=True, editable=False)  # Storage path, set by a background job
     attendees = models.ManyToManyField(CustomUser, related_name="events_attending", blank=True)
     creator = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="events_created")  # ✅ Ensure creator is properly defined
     is_completed = models.BooleanField(default=False)
     registration_deadline = models.DateTimeField(null=True, blank=True)
     capacity = models.PositiveIntegerField(null=True, blank=True)
+    # Maintained by register/unregister; lets capacity be enforced with one conditional UPDATE
+    registered_count = models.PositiveIntegerField(default=0, editable=False)
+    # Registrations marked attended, maintained alongside registered_count;
+    # EventStatsView reads both instead of grouping EventRegistration
+    attended_count = models.PositiveIntegerField(default=0, editable=False)
+    # Waitlist sequence numbers: the next one to hand out, and the lowest
+    # that may still be waiting (see events/registration.py)
+    waitlist_tail = models.PositiveBigIntegerField(default=1, editable=False)
+    waitlist_head = models.PositiveBigIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    search_vector_fields = [('title', 'A'), ('description', 'B'), ('location', 'C')]
 
+    objects = EventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='event_search_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    def cover_thumbnail_path(self):
+        stem = os.path.splitext(os.path.basename(self.event_cover.name))[0]
+        return f"event_covers/thumbnails/{self.pk}_{stem}.webp"
+
 
 class EventRegistration(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="event_registrations")
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="registrations")
     registered_at = models.DateTimeField(auto_now_add=True)
+    attended = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'event'], name='event_registration_unique'),
+        ]
 
     def __str__(self):
         return f"{self.user.email} registered for {self.event.title}"
     
     
     
-class EventImage(models.Model):
+class EventWaitlistEntry(models.Model):
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="waitlist")
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="event_waitlist_entries")
+    seq = models.PositiveBigIntegerField()
+    joined_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'user'], name='event_waitlist_user_unique'),
+            # Also the index promotion dequeues from
+            models.UniqueConstraint(fields=['event', 'seq'], name='event_waitlist_seq_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.email} waiting for {self.event.title} (#{self.seq})"
+
+
+class EventImage(ImageMetadataModel):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='gallery')
     image = models.ImageField(upload_to="event_gallery/")
     caption = models.CharField(max_length=255, blank=True)
@@ -36,4 +108,9 @@ class EventImage(models.Model):
     def __str__(self):
         return f"Image for {self.event.title}"
 
+    def refresh_image_metadata(self):
+        super().refresh_image_metadata()
+        # The event payload embeds its gallery
+        Event.objects.filter(pk=self.event_id).update(updated_at=Now())
+
 
@@ -0,0 +1,150 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest, Now
+from notifications.models import Notification
+from .models import Event, EventRegistration, EventWaitlistEntry
+
+
+class EventFull(Exception):
+    """Raised by register_attendee() to roll back the registration row."""
+
+
+def claim_seat(event):
+    """
+    Take one seat with a single conditional UPDATE. The row lock it holds
+    until commit serializes concurrent sign-ups, so events never oversell.
+    """
+    seats = Event.objects.filter(pk=event.pk)
+    if event.capacity:
+        seats = seats.filter(registered_count__lt=F('capacity'))
+    return bool(seats.update(registered_count=F('registered_count') + 1, updated_at=Now()))
+
+
+def release_seat(event, attended=False):
+    counts = {'registered_count': F('registered_count') - 1}
+    if attended:
+        counts['attended_count'] = Greatest(F('attended_count') - 1, 0)
+    Event.objects.filter(pk=event.pk, registered_count__gt=0).update(**counts, updated_at=Now())
+
+
+def mark_attended(event, user_id):
+    """
+    Flag a registration as attended and count it, once. Returns True if
+    this call marked it, False if it already was; raises
+    EventRegistration.DoesNotExist if the user isn't registered.
+    """
+    with transaction.atomic():
+        # Only the request that flips the flag bumps the counter
+        if EventRegistration.objects.filter(event=event, user_id=user_id, attended=False).update(attended=True):
+            Event.objects.filter(pk=event.pk).update(attended_count=F('attended_count') + 1, updated_at=Now())
+            return True
+    if not EventRegistration.objects.filter(event=event, user_id=user_id).exists():
+        raise EventRegistration.DoesNotExist
+    return False
+
+
+def waitlist_position(seq, head):
+    """
+    1-based place in line, computed from sequence numbers instead of counting
+    earlier rows. People who left from the middle of the line are still
+    counted until the head moves past them, so this is an upper bound; the
+    API says so alongside the value.
+    """
+    return max(seq - head + 1, 1)
+
+
+def register_attendee(event, user):
+    """
+    Register user and take a seat in one transaction. Raises IntegrityError
+    if they are already registered and EventFull if no seat is left.
+    """
+    with transaction.atomic():
+        # The unique (user, event) constraint rejects duplicates,
+        # including two sign-ups racing each other
+        registration = EventRegistration.objects.create(user=user, event=event)
+        if not claim_seat(event):
+            raise EventFull
+        event.attendees.add(user)
+        EventWaitlistEntry.objects.filter(event=event, user=user).delete()
+    return registration
+
+
+def join_waitlist(event, user):
+    """
+    Queue user for a full event. Returns (registration, None) if a seat
+    freed up since their claim failed, so they were registered instead, or
+    (None, position). Raises IntegrityError if they are already waiting.
+    """
+    with transaction.atomic():
+        # Locking the event row serializes this against unregister, which
+        # frees seats and promotes under the same lock
+        registered_count, capacity = (
+            Event.objects.select_for_update().filter(pk=event.pk).values_list('registered_count', 'capacity').get()
+        )
+        if not capacity or registered_count < capacity:
+            return register_attendee(event, user), None
+
+        # Each caller gets its own number
+        Event.objects.filter(pk=event.pk).update(waitlist_tail=F('waitlist_tail') + 1)
+        tail, head = Event.objects.filter(pk=event.pk).values_list('waitlist_tail', 'waitlist_head').get()
+        entry = EventWaitlistEntry.objects.create(event=event, user=user, seq=tail - 1)
+    return None, waitlist_position(entry.seq, head)
+
+
+def leave_waitlist(event, user):
+    """Remove user from the event's waitlist; returns False if they weren't on it."""
+    with transaction.atomic():
+        # Same lock as join_waitlist, so no new entry appears mid-update
+        Event.objects.select_for_update().filter(pk=event.pk).values_list('pk').get()
+        entry = EventWaitlistEntry.objects.filter(event=event, user=user).first()
+        if entry is None:
+            return False
+        entry.delete()
+        # If they were at the front, move the head up to whoever is first now
+        # so everyone behind them sees their place tighten
+        first_seq = (
+            EventWaitlistEntry.objects.filter(event=event).order_by('seq').values_list('seq', flat=True).first()
+        )
+        Event.objects.filter(pk=event.pk).update(
+            waitlist_head=Greatest(F('waitlist_head'), first_seq if first_seq is not None else entry.seq + 1)
+        )
+    return True
+
+
+def promote_from_waitlist(event):
+    """
+    Hand a free seat to the head of the waitlist. Call inside the
+    transaction that freed the seat. Returns the promoted user's id, or None
+    if nobody is waiting.
+    """
+    while True:
+        # Dequeue through the (event, seq) index; concurrent promotions skip
+        # each other's locked rows instead of waiting on them
+        entry = (
+            EventWaitlistEntry.objects.select_for_update(skip_locked=True)
+            .filter(event=event)
+            .order_by('seq')
+            .first()
+        )
+        if entry is None:
+            return None
+        if not claim_seat(event):
+            return None  # Still full, e.g. the capacity was lowered
+
+        entry.delete()
+        Event.objects.filter(pk=event.pk).update(waitlist_head=Greatest(F('waitlist_head'), entry.seq + 1))
+        try:
+            with transaction.atomic():
+                EventRegistration.objects.create(event=event, user_id=entry.user_id)
+        except IntegrityError:
+            # They got a seat on their own meanwhile; give this one to the next person
+            release_seat(event)
+            continue
+
+        event.attendees.add(entry.user_id)
+        Notification.objects.create(
+            recipient_id=entry.user_id,
+            message=f"A seat opened up: you're now registered for {event.title}",
+            notification_type='event_registration'
+        )
+        return entry.user_id
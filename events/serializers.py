@@ -2,14 +2,57 @@ from rest_framework import serializers
 from .models import Event, EventImage
 from users.models import CustomUser  # ✅ Import User model
 from users.serializers import UserSerializer
+from uploads.serializers import UploadSessionMixin
 
 
-class EventImageSerializer(serializers.ModelSerializer):
+class EventImageSerializer(UploadSessionMixin, serializers.ModelSerializer):
     class Meta:
         model = EventImage
-        fields = ["id", "image", "caption"]
+        fields = ["id", "image", "caption", "image_width", "image_height", "aspect_ratio", "file_size", "dominant_colors", "color_family", "upload_id"]
+        extra_kwargs = {"image": {"required": False}}
 
-class EventSerializer(serializers.ModelSerializer):
+
+class CoverThumbnailMixin(serializers.Serializer):
+    cover_thumbnail = serializers.SerializerMethodField()
+
+    def get_cover_thumbnail(self, obj):
+        # The original cover stands in until the thumbnail job has run
+        if obj.cover_thumbnail:
+            url = obj.event_cover.storage.url(obj.cover_thumbnail)
+        elif obj.event_cover:
+            url = obj.event_cover.url
+        else:
+            return None
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+
+class EventListSerializer(CoverThumbnailMixin, serializers.ModelSerializer):
+    """
+    Compact card representation for event lists. Counts come from
+    Event.objects.with_list_data() annotations; the roster is served
+    separately by events/<id>/attendees/.
+    """
+    attendee_count = serializers.IntegerField(read_only=True)
+    gallery_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Event
+        fields = [
+            "id", "title", "description", "location", "date", "event_cover", "cover_thumbnail",
+            "is_completed", "registration_deadline", "capacity", "registered_count",
+            "attendee_count", "gallery_count", "creator", "updated_at",
+        ]
+        read_only_fields = fields
+
+
+class AttendeeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CustomUser
+        fields = ["id", "username", "first_name", "last_name", "profile_picture"]
+
+
+class EventSerializer(CoverThumbnailMixin, serializers.ModelSerializer):
     attendees = serializers.PrimaryKeyRelatedField(
         queryset=CustomUser.objects.all(), many=True, required=False  # ✅ Handle Many-to-Many attendees correctly
     )
@@ -18,7 +61,7 @@ class EventSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Event
-        fields = '__all__'
+        exclude = ['search_vector', 'waitlist_head', 'waitlist_tail']
         read_only_fields = ['creator']  # ✅ Prevent frontend from passing 'creator'
 
     def create(self, validated_data):
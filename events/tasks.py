@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.db.models.functions import Now
+from jobs.registry import job
+from notifications.fanout import FANOUT_CHUNK_SIZE, fan_out
+from users.image_metadata import save_thumbnail
+from .models import Event, EventImage
+
+# Edits to the same event within this window produce one notification
+EVENT_UPDATE_COALESCE_WINDOW = timedelta(minutes=2)
+
+
+@job
+def notify_event_updated(event_id):
+    event = Event.objects.filter(pk=event_id).first()
+    if event is None:
+        return
+    attendee_ids = event.attendees.order_by('pk').values_list('pk', flat=True)
+    fan_out(
+        attendee_ids.iterator(chunk_size=FANOUT_CHUNK_SIZE),
+        message=f"The event '{event.title}' has been updated.",
+        notification_type='event_update',
+    )
+
+
+def schedule_event_update_notification(event_id):
+    notify_event_updated.enqueue(
+        delay=EVENT_UPDATE_COALESCE_WINDOW,
+        unique_key=f"notify_event_updated:{event_id}",
+        event_id=event_id,
+    )
+
+
+@job
+def extract_event_image_metadata(image_id):
+    image = EventImage.objects.filter(pk=image_id).first()
+    if image is None:
+        return
+    image.refresh_image_metadata()
+
+
+@job
+def generate_event_cover_thumbnail(event_id):
+    event = Event.objects.filter(pk=event_id).first()
+    if event is None:
+        return
+    storage = event._meta.get_field('event_cover').storage
+    old = event.cover_thumbnail
+    thumbnail = save_thumbnail(event.event_cover, event.cover_thumbnail_path()) if event.event_cover else ''
+    if old and old != thumbnail and storage.exists(old):
+        storage.delete(old)
+    Event.objects.filter(pk=event.pk).update(cover_thumbnail=thumbnail, updated_at=Now())
@@ -1,3 +1,223 @@
-from django.test import TestCase
+import pytest
+from datetime import date, timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from events.models import Event, EventImage, EventRegistration, EventWaitlistEntry
+from events.registration import join_waitlist
+from jobs.models import Job
+from jobs.worker import run_pending
+from notifications.models import Notification
+from users.models import CustomUser
 
-# Create your tests here.
+
+def make_users(count):
+    return [
+        CustomUser.objects.create_user(email=f"user{i}@example.com", password="password123", username=f"user{i}")
+        for i in range(count)
+    ]
+
+
+def make_event(creator, **kwargs):
+    kwargs.setdefault("date", date.today() + timedelta(days=7))
+    return Event.objects.create(title="Workshop", description="desc", location="Studio", creator=creator, **kwargs)
+
+
+@pytest.mark.django_db
+def test_register_enforces_capacity_and_keeps_count():
+    users = make_users(3)
+    event = make_event(users[0], capacity=2)
+    clients = []
+    for user in users:
+        client = APIClient()
+        client.force_authenticate(user=user)
+        clients.append(client)
+
+    assert clients[0].post(f"/api/events/{event.id}/register/").status_code == 201
+    response = clients[0].post(f"/api/events/{event.id}/register/")
+    assert response.status_code == 400
+    assert response.data["error"] == "Already registered for this event"
+    assert clients[1].post(f"/api/events/{event.id}/register/").status_code == 201
+    # Full: the third person is waitlisted rather than registered
+    assert clients[2].post(f"/api/events/{event.id}/register/").status_code == 202
+
+    event.refresh_from_db()
+    assert event.registered_count == 2
+    assert EventRegistration.objects.filter(event=event).count() == 2
+
+    # Unregistering frees the seat for the next person
+    assert clients[1].post(f"/api/events/{event.id}/unregister/").status_code == 200
+    assert clients[1].post(f"/api/events/{event.id}/unregister/").status_code == 400
+    assert clients[1].post(f"/api/events/{event.id}/register/").status_code == 202
+    event.refresh_from_db()
+    assert event.registered_count == 2
+
+
+@pytest.mark.django_db
+def test_register_checks_registration_deadline():
+    user, creator = make_users(2)
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    open_event = make_event(creator, registration_deadline=timezone.now() + timedelta(days=1))
+    assert client.post(f"/api/events/{open_event.id}/register/").status_code == 201
+
+    closed_event = make_event(creator, registration_deadline=timezone.now() - timedelta(hours=1))
+    response = client.post(f"/api/events/{closed_event.id}/register/")
+    assert response.status_code == 400
+    assert response.data["error"] == "Registration period has ended"
+
+
+@pytest.mark.django_db
+def test_full_event_waitlists_and_promotes_in_order():
+    users = make_users(4)
+    event = make_event(users[0], capacity=1)
+    clients = []
+    for user in users:
+        client = APIClient()
+        client.force_authenticate(user=user)
+        clients.append(client)
+
+    assert clients[0].post(f"/api/events/{event.id}/register/").status_code == 201
+    for expected, client in enumerate(clients[1:], start=1):
+        response = client.post(f"/api/events/{event.id}/register/")
+        assert response.status_code == 202
+        assert response.data["waitlist_position"] == expected
+    assert clients[1].post(f"/api/events/{event.id}/register/").status_code == 400
+
+    # Leaving from the middle frees the spot only once the head passes, so
+    # positions are reported as an upper bound
+    assert clients[2].post(f"/api/events/{event.id}/leave_waitlist/").status_code == 200
+    response = clients[3].get(f"/api/events/{event.id}/waitlist/")
+    assert response.data["waitlist_position"] == 3
+    assert response.data["waitlist_position_is_upper_bound"] is True
+
+    # The seat goes to the head of the line in the same request
+    assert clients[0].post(f"/api/events/{event.id}/unregister/").status_code == 200
+    assert EventRegistration.objects.filter(event=event, user=users[1]).exists()
+    assert clients[1].get(f"/api/events/{event.id}/waitlist/").status_code == 404
+    assert clients[3].get(f"/api/events/{event.id}/waitlist/").data["waitlist_position"] == 2
+
+    assert clients[1].post(f"/api/events/{event.id}/unregister/").status_code == 200
+    assert EventRegistration.objects.filter(event=event, user=users[3]).exists()
+    event.refresh_from_db()
+    assert event.registered_count == 1
+
+
+@pytest.mark.django_db
+def test_head_leaving_waitlist_moves_everyone_up():
+    users = make_users(4)
+    event = make_event(users[0], capacity=1)
+    clients = []
+    for user in users:
+        client = APIClient()
+        client.force_authenticate(user=user)
+        client.post(f"/api/events/{event.id}/register/")
+        clients.append(client)
+
+    assert clients[1].post(f"/api/events/{event.id}/leave_waitlist/").status_code == 200
+    assert clients[2].get(f"/api/events/{event.id}/waitlist/").data["waitlist_position"] == 1
+    assert clients[3].get(f"/api/events/{event.id}/waitlist/").data["waitlist_position"] == 2
+
+
+@pytest.mark.django_db
+def test_join_waitlist_takes_a_seat_freed_after_the_failed_claim():
+    users = make_users(2)
+    event = make_event(users[0], capacity=1)
+    # The seat was released between the failed claim and joining the line
+    registration, position = join_waitlist(event, users[1])
+
+    assert position is None
+    assert registration.user == users[1]
+    assert not EventWaitlistEntry.objects.filter(event=event).exists()
+    event.refresh_from_db()
+    assert event.registered_count == 1
+
+
+@pytest.mark.django_db
+def test_event_edits_are_coalesced_into_one_bulk_fan_out():
+    admin = CustomUser.objects.create_user(email="admin@example.com", password="password123", username="admin", role="admin")
+    attendees = make_users(5)
+    event = make_event(admin)
+    event.attendees.set(attendees)
+    client = APIClient()
+    client.force_authenticate(user=admin)
+
+    for title in ["Workshop v2", "Workshop v3"]:
+        assert client.patch(f"/api/events/{event.id}/", {"title": title}, format="multipart").status_code == 200
+    assert Job.objects.filter(task__endswith="notify_event_updated").count() == 1
+
+    Job.objects.update(run_at=timezone.now())
+    with CaptureQueriesContext(connection) as queries:
+        assert run_pending() == 1
+    inserts = [q for q in queries.captured_queries if q["sql"].startswith('INSERT INTO "notifications_notification"')]
+    assert len(inserts) == 1
+    notifications = Notification.objects.filter(notification_type="event_update")
+    assert sorted(notifications.values_list("recipient_id", flat=True)) == sorted(a.id for a in attendees)
+    assert notifications.first().message == "The event 'Workshop v3' has been updated."
+
+
+@pytest.mark.django_db
+def test_event_list_is_compact_and_roster_is_paginated(django_assert_max_num_queries):
+    users = make_users(6)
+    for i in range(3):
+        event = make_event(users[0])
+        event.attendees.set(users[:i + 2])
+        EventImage.objects.create(event=event, image="event_gallery/a.jpg")
+    client = APIClient()
+    client.force_authenticate(user=users[1])
+
+    # ETag aggregate, paginator COUNT and the page itself
+    with django_assert_max_num_queries(3):
+        response = client.get("/api/events/")
+    assert response.status_code == 200
+    card = response.data["results"][0]
+    assert "attendees" not in card and "gallery" not in card
+    assert sorted(item["attendee_count"] for item in response.data["results"]) == [2, 3, 4]
+    assert {item["gallery_count"] for item in response.data["results"]} == {1}
+
+    response = client.get(f"/api/events/{event.id}/attendees/", {"page_size": 3})
+    assert response.status_code == 200
+    assert response.data["count"] == 4
+    assert [a["id"] for a in response.data["results"]] == [u.id for u in users[:3]]
+    assert "email" not in response.data["results"][0]
+
+
+@pytest.mark.django_db
+def test_event_stats_read_maintained_counts(django_assert_max_num_queries):
+    users = make_users(3)
+    admin = CustomUser.objects.create_user(
+        email="admin@example.com", password="password123", username="admin", role="admin"
+    )
+    event = make_event(users[0])
+    make_event(users[0], date=date.today() - timedelta(days=7))
+    clients = []
+    for user in users:
+        client = APIClient()
+        client.force_authenticate(user=user)
+        client.post(f"/api/events/{event.id}/register/")
+        clients.append(client)
+    admin_client = APIClient()
+    admin_client.force_authenticate(user=admin)
+
+    assert admin_client.post(f"/api/events/{event.id}/mark_attended/", {"user_id": users[0].id}).status_code == 200
+    # Marking twice neither double-counts nor re-notifies
+    assert admin_client.post(f"/api/events/{event.id}/mark_attended/", {"user_id": users[0].id}).status_code == 200
+    assert admin_client.post(f"/api/events/{event.id}/mark_attended/", {"user_id": users[1].id}).status_code == 200
+    assert Notification.objects.filter(notification_type="event_attendance").count() == 2
+    # An attendee who unregisters takes their attendance with them
+    assert clients[1].post(f"/api/events/{event.id}/unregister/").status_code == 200
+
+    event.refresh_from_db()
+    assert (event.registered_count, event.attended_count) == (2, 1)
+
+    # Event totals, events with registrations and the caller's own registrations
+    with django_assert_max_num_queries(3):
+        response = clients[0].get("/api/event-stats/")
+    assert response.status_code == 200
+    assert (response.data["total_events"], response.data["completed_events"], response.data["upcoming_events"]) == (2, 1, 1)
+    assert response.data["participation_stats"] == [{
+        "event__title": "Workshop", "event__date": event.date, "participant_count": 2, "attended_count": 1,
+    }]
+    assert response.data["user_stats"] == {"registered_events": 1, "attended_events": 1}
@@ -4,51 +4,105 @@ from rest_framework.permissions import IsAuthenticated, AllowAny, IsAuthenticate
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.views import APIView
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.pagination import PageNumberPagination
-from django.db import models, transaction
+from django.db import IntegrityError, models, transaction
 from django.db.models import Count
-from django.shortcuts import get_object_or_404
+from django.db.models.functions import Now
 from datetime import datetime
 from notifications.models import Notification
 from users.permissions import IsAdminUser
-from .models import Event, EventRegistration, EventImage
-from .serializers import EventSerializer, EventImageSerializer
+from users.filters import FullTextSearchFilter
+from users.conditional import ConditionalGetMixin
+from users.exports import stream_export, get_export_format
+from .models import Event, EventRegistration, EventImage, EventWaitlistEntry
+from .registration import (
+    EventFull, join_waitlist, leave_waitlist, mark_attended, promote_from_waitlist, register_attendee, release_seat,
+    waitlist_position,
+)
+from .serializers import AttendeeSerializer, EventListSerializer, EventSerializer, EventImageSerializer
+from .tasks import extract_event_image_metadata, generate_event_cover_thumbnail, schedule_event_update_notification
 import logging
 from django.utils import timezone
 
 
 logger = logging.getLogger(__name__)
 
+
 class EventPagination(PageNumberPagination):
     page_size = 8
     page_size_query_param = 'page_size'
     max_page_size = 100
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class AttendeePagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class EventViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Event.objects.all().order_by('-date')
     serializer_class = EventSerializer
     parser_classes = (MultiPartParser, FormParser)
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, filters.OrderingFilter]
     pagination_class = EventPagination
     filterset_fields = ['date', 'location']
     search_fields = ['title', 'description', 'location']
     ordering_fields = ['date', 'created_at']
     ordering = ['-date']
 
+    # Actions that return many events use the compact card payload
+    list_actions = ['list', 'upcoming', 'past', 'registered', 'my_events', 'my_registrations']
+
+    export_columns = [
+        ('id', 'id'),
+        ('title', 'title'),
+        ('description', 'description'),
+        ('location', 'location'),
+        ('date', 'date'),
+        ('capacity', 'capacity'),
+        ('registration_deadline', 'registration_deadline'),
+        ('is_completed', 'is_completed'),
+        ('creator_email', 'creator__email'),
+        ('updated_at', 'updated_at'),
+    ]
+    registration_export_columns = [
+        ('id', 'id'),
+        ('event_id', 'event_id'),
+        ('event_title', 'event__title'),
+        ('event_date', 'event__date'),
+        ('user_id', 'user_id'),
+        ('user_email', 'user__email'),
+        ('registered_at', 'registered_at'),
+    ]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in self.list_actions:
+            queryset = queryset.with_list_data()
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action in self.list_actions:
+            return EventListSerializer
+        return super().get_serializer_class()
+
     def get_permissions(self):
         if self.action in ['create', 'update', 'destroy', 'registrations']:
             permission_classes = [IsAdminUser]
         elif self.action in ['register', 'unregister', 'my_events', 'my_registrations']:
             permission_classes = [IsAuthenticated]
         else:
-            permission_classes = [AllowAny]
+            # Default AllowAny, or whatever an @action declared
+            permission_classes = self.permission_classes
         return [permission() for permission in permission_classes]
 
     def perform_create(self, serializer):
         try:
-            serializer.save(creator=self.request.user)
+            instance = serializer.save(creator=self.request.user)
+            if instance.event_cover:
+                generate_event_cover_thumbnail.enqueue(event_id=instance.id)
             logger.info(f"Event created by {self.request.user.email}")
         except Exception as e:
             logger.error(f"Error creating event: {str(e)}")
@@ -57,13 +111,11 @@ class EventViewSet(viewsets.ModelViewSet):
     def perform_update(self, serializer):
         try:
             instance = serializer.save()
-            # Notify attendees of changes
-            for attendee in instance.attendees.all():
-                Notification.objects.create(
-                    recipient=attendee,
-                    message=f"The event '{instance.title}' has been updated.",
-                    notification_type='event_update'
-                )
+            if 'event_cover' in serializer.validated_data:
+                generate_event_cover_thumbnail.enqueue(event_id=instance.id)
+            # Attendees are notified by the background worker, once per
+            # burst of edits
+            schedule_event_update_notification(instance.id)
             logger.info(f"Event {instance.id} updated by {self.request.user.email}")
         except Exception as e:
             logger.error(f"Error updating event: {str(e)}")
@@ -96,77 +148,76 @@ class EventViewSet(viewsets.ModelViewSet):
         event = self.get_object()
         user = request.user
 
-        try:
-            with transaction.atomic():
-                # Check if registration is allowed
-                if event.registration_deadline and datetime.now() > event.registration_deadline:
-                    return Response(
-                        {"error": "Registration period has ended"},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-
-                if event.date <= datetime.now().date():
-                    return Response(
-                        {"error": "Cannot register for past events"},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-
-                # Prevent duplicate registration
-                if EventRegistration.objects.filter(user=user, event=event).exists():
-                    return Response(
-                        {"error": "Already registered for this event"},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-
-                # Check capacity if event has limit
-                if event.capacity and event.attendees.count() >= event.capacity:
-                    return Response(
-                        {"error": "Event has reached maximum capacity"},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-
-                # Create registration record
-                registration = EventRegistration.objects.create(
-                    user=user,
-                    event=event,
-                )
+        # Check if registration is allowed
+        if event.registration_deadline and timezone.now() > event.registration_deadline:
+            return Response(
+                {"error": "Registration period has ended"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-                # Add to attendees (optional M2M)
-                event.attendees.add(user)
+        if event.date <= timezone.localdate():
+            return Response(
+                {"error": "Cannot register for past events"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-                # Create notification
-                Notification.objects.create(
-                    recipient=user,
-                    message=f"You've successfully registered for {event.title}",
-                    notification_type='event_registration'
+        try:
+            registration = register_attendee(event, user)
+        except IntegrityError:
+            return Response(
+                {"error": "Already registered for this event"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except EventFull:
+            # Queue them instead of refusing, so they don't keep retrying
+            try:
+                registration, position = join_waitlist(event, user)
+            except IntegrityError:
+                return Response(
+                    {"error": "Already on the waitlist for this event"},
+                    status=status.HTTP_400_BAD_REQUEST
                 )
-
-                logger.info(f"User {user.email} registered for event {event.id}")
-
+            if registration is None:
                 return Response(
                     {
-                        "message": "Successfully registered!",
-                        "registration_id": registration.id,
-                        "event_details": {
-                            "title": event.title,
-                            "date": event.date,
-                            "location": event.location
-                        }
+                        "message": "Event is full, you have been added to the waitlist",
+                        "waitlist_position": position,
+                        "waitlist_position_is_upper_bound": True,
                     },
-                    status=status.HTTP_201_CREATED
+                    status=status.HTTP_202_ACCEPTED
                 )
-
+            # A seat was freed after the first attempt and went to them
         except Exception as e:
             logger.error(f"Registration error: {str(e)}")
             return Response(
                 {"error": "Registration failed"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-            
+
+        Notification.objects.create(
+            recipient=user,
+            message=f"You've successfully registered for {event.title}",
+            notification_type='event_registration'
+        )
+        logger.info(f"User {user.email} registered for event {event.id}")
+
+        return Response(
+            {
+                "message": "Successfully registered!",
+                "registration_id": registration.id,
+                "event_details": {
+                    "title": event.title,
+                    "date": event.date,
+                    "location": event.location
+                }
+            },
+            status=status.HTTP_201_CREATED
+        )
+
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def registered(self, request):
         user = request.user
-        registered_events = self.queryset.filter(attendees=user)
+        registered_events = self.get_queryset().filter(attendees=user)
         serializer = self.get_serializer(registered_events, many=True)
         return Response(serializer.data)
 
@@ -177,23 +228,22 @@ class EventViewSet(viewsets.ModelViewSet):
         event = self.get_object()
         user = request.user
 
+        # Check if unregistration is allowed
+        if event.date <= timezone.localdate():
+            return Response(
+                {"error": "Cannot unregister from past events"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
             with transaction.atomic():
-                registration = get_object_or_404(
-                    EventRegistration,
-                    user=user,
-                    event=event
-                )
-
-                # Check if unregistration is allowed
-                if event.date <= datetime.now().date():
-                    return Response(
-                        {"error": "Cannot unregister from past events"},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-
+                registration = EventRegistration.objects.select_for_update().get(user=user, event=event)
                 registration.delete()
 
+                # Free the seat and hand it to whoever is first in line
+                release_seat(event, attended=registration.attended)
+                promote_from_waitlist(event)
+
                 # Remove from attendees if using M2M
                 event.attendees.remove(user)
 
@@ -223,19 +273,48 @@ class EventViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def attendees(self, request, pk=None):
+        """Paginated roster of an event's attendees"""
+        event = self.get_object()
+        paginator = AttendeePagination()
+        page = paginator.paginate_queryset(event.attendees.order_by('id'), request, view=self)
+        serializer = AttendeeSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def waitlist(self, request, pk=None):
+        """The current user's place on the event's waitlist"""
+        event = self.get_object()
+        entry = EventWaitlistEntry.objects.filter(event=event, user=request.user).first()
+        if entry is None:
+            return Response({"error": "Not on the waitlist for this event"}, status=status.HTTP_404_NOT_FOUND)
+        return Response({
+            "waitlist_position": waitlist_position(entry.seq, event.waitlist_head),
+            "waitlist_position_is_upper_bound": True,
+        })
+
+    @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
+    def leave_waitlist(self, request, pk=None):
+        """Leave the event's waitlist"""
+        event = self.get_object()
+        if not leave_waitlist(event, request.user):
+            return Response({"error": "Not on the waitlist for this event"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"message": "Left the waitlist"}, status=status.HTTP_200_OK)
+
     @action(detail=True, methods=['get'], permission_classes=[IsAdminUser])
     def registrations(self, request, pk=None):
         """Get all registrations for an event (admin only)"""
         event = self.get_object()
         registrations = EventRegistration.objects.filter(
             event=event
-        ).select_related('user').order_by('-registration_date')
+        ).select_related('user').order_by('-registered_at')
 
         data = [{
             'user_id': reg.user.id,
             'username': reg.user.username,
             'email': reg.user.email,
-            'registration_date': reg.registration_date,
+            'registration_date': reg.registered_at,
             'attended': reg.attended
         } for reg in registrations]
 
@@ -244,15 +323,11 @@ class EventViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_registrations(self, request):
         """Get all events the current user is registered for"""
-        registrations = EventRegistration.objects.filter(
-            user=request.user
-        ).select_related('event').order_by('-registered_at')
+        events = self.get_queryset().filter(
+            registrations__user=request.user
+        ).order_by('-registrations__registered_at')
 
-        serializer = self.get_serializer(
-            [reg.event for reg in registrations],
-            many=True,
-            context={'request': request}
-        )
+        serializer = self.get_serializer(events, many=True)
         return Response(serializer.data)
 
     @action(detail=True, methods=['post'], permission_classes=[IsAdminUser])
@@ -268,18 +343,12 @@ class EventViewSet(viewsets.ModelViewSet):
             )
 
         try:
-            registration = EventRegistration.objects.get(
-                event=event,
-                user__id=user_id
-            )
-            registration.attended = True
-            registration.save()
-
-            Notification.objects.create(
-                recipient=registration.user,
-                message=f"Your attendance for {event.title} has been confirmed",
-                notification_type='event_attendance'
-            )
+            if mark_attended(event, user_id):
+                Notification.objects.create(
+                    recipient_id=user_id,
+                    message=f"Your attendance for {event.title} has been confirmed",
+                    notification_type='event_attendance'
+                )
 
             return Response(
                 {"message": f"Attendance marked for user {user_id}"},
@@ -293,9 +362,31 @@ class EventViewSet(viewsets.ModelViewSet):
             )
             
             
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def export(self, request):
+        """Stream every event matching the usual filters as NDJSON or CSV"""
+        export_format = get_export_format(request)
+        if export_format is None:
+            return Response({"error": "export_format must be 'ndjson' or 'csv'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.filter_queryset(self.get_queryset()).order_by('id')
+        return stream_export(queryset, self.export_columns, export_format, "events")
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def export_registrations(self, request):
+        """Stream event registrations, optionally for one ?event=<id>, as NDJSON or CSV"""
+        export_format = get_export_format(request)
+        if export_format is None:
+            return Response({"error": "export_format must be 'ndjson' or 'csv'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = EventRegistration.objects.order_by('id')
+        if request.query_params.get('event'):
+            queryset = queryset.filter(event_id=request.query_params['event'])
+        return stream_export(queryset, self.registration_export_columns, export_format, "event-registrations")
+
     @action(detail=False, methods=["get"], permission_classes=[AllowAny])
     def past(self, request):
-        past_events = Event.objects.filter(date__lt=timezone.now()).order_by("-date")
+        past_events = self.get_queryset().filter(date__lt=timezone.now()).order_by("-date")
         page = self.paginate_queryset(past_events)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -309,45 +400,40 @@ class EventStatsView(APIView):
 
     def get(self, request):
         """Get event statistics"""
-        total_events = Event.objects.count()
-        completed_events = Event.objects.filter(
-            date__lt=datetime.now().date()
-        ).count()
-        upcoming_events = Event.objects.filter(
-            date__gte=datetime.now().date()
-        ).count()
-
-        # Participation statistics
-        participation_stats = (
-            EventRegistration.objects
-            .values("event__title", "event__date")
-            .annotate(
-                participant_count=Count("user"),
-                attended_count=Count("user", filter=models.Q(attended=True))
-            )
-            .order_by("-event__date")
+        today = timezone.localdate()
+        totals = Event.objects.aggregate(
+            total_events=Count("id"),
+            completed_events=Count("id", filter=models.Q(date__lt=today)),
+            upcoming_events=Count("id", filter=models.Q(date__gte=today)),
         )
 
+        # Per-event counts are kept on the event row (see events/registration.py),
+        # so this skips the GROUP BY over registrations
+        participation_stats = [
+            {
+                "event__title": title,
+                "event__date": event_date,
+                "participant_count": registered,
+                "attended_count": attended,
+            }
+            for title, event_date, registered, attended in (
+                Event.objects.filter(registered_count__gt=0)
+                .order_by("-date")
+                .values_list("title", "date", "registered_count", "attended_count")
+            )
+        ]
+
         # User-specific stats if not admin
         user_stats = {}
         if not request.user.is_staff:
-            user_registrations = EventRegistration.objects.filter(
-                user=request.user
-            ).count()
-            user_attended = EventRegistration.objects.filter(
-                user=request.user,
-                attended=True
-            ).count()
-            user_stats = {
-                "registered_events": user_registrations,
-                "attended_events": user_attended
-            }
+            user_stats = EventRegistration.objects.filter(user=request.user).aggregate(
+                registered_events=Count("id"),
+                attended_events=Count("id", filter=models.Q(attended=True)),
+            )
 
         return Response({
-            "total_events": total_events,
-            "completed_events": completed_events,
-            "upcoming_events": upcoming_events,
-            "participation_stats": list(participation_stats),
+            **totals,
+            "participation_stats": participation_stats,
             "user_stats": user_stats
         })
         
@@ -361,19 +447,42 @@ class UpcomingEventCountView(APIView):
     
     
 class PastEventViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Event.objects.filter(date__lt=timezone.now()).order_by("-date")
     serializer_class = EventSerializer
     permission_classes = [AllowAny]
+
+    def get_queryset(self):
+        queryset = Event.objects.filter(date__lt=timezone.now()).order_by("-date")
+        if self.action == 'list':
+            queryset = queryset.with_list_data()
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return EventListSerializer
+        return super().get_serializer_class()
     
     
     
 class EventImageViewSet(viewsets.ModelViewSet):
     queryset = EventImage.objects.all().order_by("-id")
     serializer_class = EventImageSerializer
-    parser_classes = [MultiPartParser, FormParser]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ["event"]
+    filterset_fields = ["event", "color_family"]
 
     def perform_create(self, serializer):
-        serializer.save()
\ No newline at end of file
+        image = serializer.save()
+        # The event payload embeds its gallery
+        Event.objects.filter(pk=image.event_id).update(updated_at=Now())
+        extract_event_image_metadata.enqueue(image_id=image.pk)
+
+    def perform_update(self, serializer):
+        image = serializer.save()
+        Event.objects.filter(pk=image.event_id).update(updated_at=Now())
+        if 'image' in serializer.validated_data:
+            extract_event_image_metadata.enqueue(image_id=image.pk)
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        Event.objects.filter(pk=instance.event_id).update(updated_at=Now())
\ No newline at end of file
@@ -0,0 +1,48 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from jobs.worker import claim_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = "Run background jobs from the database queue"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=2, help="Number of worker threads")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to sleep when the queue is empty")
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty")
+
+    def handle(self, *args, **options):
+        self.stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: self.stop.set())
+        signal.signal(signal.SIGINT, lambda *_: self.stop.set())
+
+        threads = [
+            threading.Thread(target=self.work, args=(options["poll_interval"], options["once"]), name=f"worker-{i}")
+            for i in range(options["concurrency"])
+        ]
+        self.stdout.write(f"Starting {len(threads)} worker thread(s)")
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=1)
+        self.stdout.write(self.style.SUCCESS("Worker stopped."))
+
+    def work(self, poll_interval, once):
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                jobs = claim_jobs()
+                if not jobs:
+                    if once:
+                        break
+                    self.stop.wait(poll_interval)
+                    continue
+                for job in jobs:
+                    run_job(job)
+        finally:
+            connections.close_all()
@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Job
+
+_tasks = {}
+
+
+def job(func=None, *, name=None, max_attempts=5):
+    """
+    Register a function as a background task.
+
+        @job
+        def send_report(report_id):
+            ...
+
+        send_report.enqueue(report_id=3)
+
+    Passing unique_key= coalesces calls: while a job with that key is still
+    queued, further enqueues return it instead of adding another. Combine it
+    with a delay to batch bursts of calls into one run.
+
+    Keyword arguments passed to enqueue() are stored as JSON, so they must be
+    plain values (ids, strings), not model instances.
+    """
+    def decorator(func):
+        task_name = name or f"{func.__module__}.{func.__name__}"
+        _tasks[task_name] = func
+
+        def enqueue(delay=None, unique_key=None, **kwargs):
+            fields = {
+                'task': task_name,
+                'payload': kwargs,
+                'max_attempts': max_attempts,
+                'run_at': timezone.now() + (delay or timedelta()),
+            }
+            if not unique_key:
+                return Job.objects.create(**fields)
+            try:
+                with transaction.atomic():
+                    return Job.objects.create(unique_key=unique_key, **fields)
+            except IntegrityError:
+                # The same work is already waiting to run and will cover this call
+                return Job.objects.filter(unique_key=unique_key, status='queued').first()
+
+        func.task_name = task_name
+        func.enqueue = enqueue
+        return func
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def get_task(name):
+    return _tasks[name]
@@ -0,0 +1,58 @@
+import pytest
+from django.utils import timezone
+from jobs.models import Job
+from jobs.registry import job
+from jobs.worker import claim_jobs, run_job, run_pending
+
+calls = []
+
+
+@job(max_attempts=2)
+def flaky_task(fail):
+    calls.append(fail)
+    if fail:
+        raise RuntimeError("boom")
+
+
+@pytest.mark.django_db
+def test_successful_job_is_removed():
+    calls.clear()
+    flaky_task.enqueue(fail=False)
+
+    assert run_pending() == 1
+    assert calls == [False]
+    assert not Job.objects.exists()
+
+
+@pytest.mark.django_db
+def test_failing_job_is_retried_with_backoff_then_marked_failed():
+    flaky_task.enqueue(fail=True)
+
+    [claimed] = claim_jobs()
+    assert claimed.attempts == 1
+    run_job(claimed)
+
+    retry = Job.objects.get()
+    assert retry.status == "queued"
+    assert retry.run_at > timezone.now()
+    assert "boom" in retry.last_error
+    assert claim_jobs() == []  # Not due yet
+
+    Job.objects.update(run_at=timezone.now())
+    [claimed] = claim_jobs()
+    run_job(claimed)
+    assert Job.objects.get().status == "failed"
+
+
+@pytest.mark.django_db
+def test_unique_key_coalesces_queued_jobs():
+    calls.clear()
+    first = flaky_task.enqueue(unique_key="flaky:1", fail=False)
+    second = flaky_task.enqueue(unique_key="flaky:1", fail=False)
+    assert first.pk == second.pk
+    flaky_task.enqueue(unique_key="flaky:2", fail=False)
+    assert Job.objects.count() == 2
+
+    # Once the job is running, a new call queues fresh work
+    [claimed] = claim_jobs()
+    assert flaky_task.enqueue(unique_key=claimed.unique_key, fail=False).pk != claimed.pk
@@ -0,0 +1,95 @@
+import logging
+import random
+import traceback
+from datetime import timedelta
+
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_task
+
+logger = logging.getLogger(__name__)
+
+
+LEASE_SECONDS = 300
+BACKOFF_BASE_SECONDS = 10
+BACKOFF_MAX_SECONDS = 3600
+
+
+def claim_jobs(limit=1, lease_seconds=LEASE_SECONDS):
+    """
+    Lease up to `limit` due jobs to the calling worker.
+
+    Rows are locked with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent
+    workers never claim the same job and never wait on each other. Jobs whose
+    lease ran out (the worker died mid-run) are picked up again.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status='queued', run_at__lte=now)
+                | Q(status='running', locked_until__lt=now)
+            )
+            .order_by('run_at')[:limit]
+        )
+        if jobs:
+            Job.objects.filter(pk__in=[j.pk for j in jobs]).update(
+                status='running',
+                attempts=F('attempts') + 1,
+                locked_until=now + timedelta(seconds=lease_seconds),
+            )
+    for j in jobs:
+        j.attempts += 1
+    return jobs
+
+
+def backoff_delay(attempts):
+    # Exponential backoff with jitter: ~10s, 20s, 40s ... capped at an hour
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def run_job(job):
+    try:
+        get_task(job.task)(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            logger.error(f"Job {job.pk} ({job.task}) failed permanently: {error}")
+            Job.objects.filter(pk=job.pk).update(status='failed', locked_until=None, last_error=error)
+        else:
+            logger.warning(f"Job {job.pk} ({job.task}) failed, retrying: {error}")
+            try:
+                with transaction.atomic():
+                    Job.objects.filter(pk=job.pk).update(
+                        status='queued',
+                        locked_until=None,
+                        run_at=timezone.now() + backoff_delay(job.attempts),
+                        last_error=error,
+                    )
+            except IntegrityError:
+                # A newer job with the same unique_key is queued and will redo the work
+                Job.objects.filter(pk=job.pk).delete()
+        return False
+
+    # Finished jobs are removed so the queue table only holds live work
+    Job.objects.filter(pk=job.pk).delete()
+    return True
+
+
+def run_pending(limit=100):
+    """Run due jobs in the current thread until none are left. Returns the count run."""
+    count = 0
+    while count < limit:
+        jobs = claim_jobs()
+        if not jobs:
+            break
+        for j in jobs:
+            run_job(j)
+            count += 1
+        close_old_connections()
+    return count
@@ -0,0 +1,25 @@
+from itertools import islice
+
+from .models import Notification
+
+FANOUT_CHUNK_SIZE = 500
+
+
+def fan_out(recipient_ids, message, notification_type, chunk_size=FANOUT_CHUNK_SIZE):
+    """
+    Send the same notification to many users with one bulk INSERT per
+    chunk. recipient_ids can be a lazy iterator (e.g. a values_list
+    queryset's .iterator()), so large audiences are never held in memory.
+    Returns the number of notifications created.
+    """
+    recipient_ids = iter(recipient_ids)
+    sent = 0
+    while True:
+        chunk = list(islice(recipient_ids, chunk_size))
+        if not chunk:
+            return sent
+        Notification.objects.bulk_create([
+            Notification(recipient_id=recipient_id, message=message, notification_type=notification_type)
+            for recipient_id in chunk
+        ])
+        sent += len(chunk)
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.5 on 2026-10-16 22:42
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+from users.search import build_search_vector
+
+
+def backfill_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Project = apps.get_model('projects', 'Project')
+    Project.objects.update(search_vector=build_search_vector([('title', 'A'), ('description', 'B')]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_rename_timestamp_projectprogress_created_at_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='project_search_idx'),
+        ),
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+    ]
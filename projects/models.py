@@ -1,8 +1,12 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from users.models import CustomUser
+from users.image_metadata import ImageMetadataModel
+from users.search import SearchVectorMixin
 from django.utils import timezone
 
-class Project(models.Model):
+class Project(SearchVectorMixin, ImageMetadataModel):
     title = models.CharField(max_length=255)
     description = models.TextField()
     start_date = models.DateField(default=timezone.now)  # ✅ Default start date
@@ -11,7 +15,15 @@ class Project(models.Model):
     creator = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="projects_created")
     is_completed = models.BooleanField(default=False)
     image = models.ImageField(upload_to="project_images/", null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
 
+    search_vector_fields = [('title', 'A'), ('description', 'B')]
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='project_search_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -21,7 +21,7 @@ class ProjectSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Project
-        fields = '__all__'
+        exclude = ['search_vector']
         read_only_fields = ['creator']  # ✅ Prevent frontend from passing 'creator'
         extra_kwargs = {
             "title": {"required": True},
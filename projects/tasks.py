@@ -0,0 +1,10 @@
+from jobs.registry import job
+from .models import Project
+
+
+@job
+def extract_project_image_metadata(project_id):
+    project = Project.objects.filter(pk=project_id).first()
+    if project is None:
+        return
+    project.refresh_image_metadata()
@@ -2,10 +2,15 @@ from notifications.models import Notification
 from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
 from users.permissions import IsAdminUser
+from users.filters import FullTextSearchFilter
+from users.conditional import ConditionalGetMixin
+from users.exports import stream_export, get_export_format
 from .models import Project, ProjectProgress
 from .serializers import ProjectSerializer, ProjectProgressSerializer, MemberSerializer
+from .tasks import extract_project_image_metadata
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework import status
@@ -14,26 +19,38 @@ from rest_framework.permissions import AllowAny
 from users.models import CustomUser
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, filters.OrderingFilter]
     parser_classes = [JSONParser, MultiPartParser, FormParser]
     
     # Enable filtering by start_date and members
-    filterset_fields = ['start_date', 'members']
+    filterset_fields = ['start_date', 'members', 'color_family']
 
     # Enable search by project title and description
     search_fields = ['title', 'description']
 
     # Enable ordering by start_date
     ordering_fields = ['start_date']
+
+    export_columns = [
+        ('id', 'id'),
+        ('title', 'title'),
+        ('description', 'description'),
+        ('start_date', 'start_date'),
+        ('end_date', 'end_date'),
+        ('is_completed', 'is_completed'),
+        ('creator_email', 'creator__email'),
+        ('image', 'image'),
+        ('updated_at', 'updated_at'),
+    ]
     
     
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             self.permission_classes = [IsAuthenticated]  # Only admins can modify
-        else:
+        elif self.action in ['list', 'retrieve']:
             self.permission_classes = [AllowAny]  # Members can only view
         return super().get_permissions()
     
@@ -48,7 +65,9 @@ class ProjectViewSet(viewsets.ModelViewSet):
     
     
     def perform_create(self, serializer):
-        serializer.save(creator=self.request.user)  # ✅ Automatically assign logged-in user
+        project = serializer.save(creator=self.request.user)  # ✅ Automatically assign logged-in user
+        if project.image:
+            extract_project_image_metadata.enqueue(project_id=project.pk)
         
         
         
@@ -56,6 +75,8 @@ class ProjectViewSet(viewsets.ModelViewSet):
         instance = serializer.instance
         old_members = set(instance.members.all())
         serializer.save()
+        if 'image' in serializer.validated_data:
+            extract_project_image_metadata.enqueue(project_id=instance.pk)
         new_members = set(instance.members.all()) - old_members
         for member in new_members:
             Notification.objects.create(
@@ -73,6 +94,17 @@ class ProjectViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
             
             
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def export(self, request):
+        """Stream every project matching the usual filters as NDJSON or CSV"""
+        export_format = get_export_format(request)
+        if export_format is None:
+            return Response({"error": "export_format must be 'ndjson' or 'csv'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.filter_queryset(self.get_queryset()).order_by('id')
+        return stream_export(queryset, self.export_columns, export_format, "projects")
+            
+            
     def get_queryset(self):
         queryset = Project.objects.all()
         if self.request.query_params.get('all') == 'true':
@@ -118,6 +150,8 @@ class ProjectProgressView(APIView):
             serializer = ProjectProgressSerializer(data=request.data)
             if serializer.is_valid():
                 serializer.save(project=project)
+                # The project payload embeds its progress updates
+                Project.objects.filter(pk=project.pk).update(updated_at=timezone.now())
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         except Project.DoesNotExist:
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from uploads.models import UploadSession
+
+
+class Command(BaseCommand):
+    help = "Delete upload sessions (and their temp files) that have not been touched recently"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=24, help="Age of the last chunk in hours")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options["hours"])
+        count = 0
+        for session in UploadSession.objects.filter(updated_at__lt=cutoff).iterator():
+            session.discard()
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Removed {count} stale upload sessions."))
@@ -0,0 +1,55 @@
+import os
+
+from django.conf import settings
+from rest_framework import serializers
+from .models import UploadSession
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'filename', 'total_size', 'received_size', 'status', 'created_at']
+        read_only_fields = ['received_size', 'status', 'created_at']
+
+    def validate_filename(self, value):
+        return os.path.basename(value)
+
+    def validate_total_size(self, value):
+        if value <= 0 or value > settings.UPLOAD_SESSION_MAX_SIZE:
+            raise serializers.ValidationError(f"Size must be between 1 and {settings.UPLOAD_SESSION_MAX_SIZE} bytes.")
+        return value
+
+
+class UploadSessionMixin(serializers.Serializer):
+    """
+    Lets a model serializer take a finished chunked upload instead of a
+    multipart file: pass `upload_id` and the assembled file is assigned to
+    `upload_file_field`. The session and its temp file are removed once the
+    model is saved.
+    """
+    upload_id = serializers.UUIDField(write_only=True, required=False)
+    upload_file_field = 'image'
+
+    def validate(self, attrs):
+        upload_id = attrs.pop('upload_id', None)
+        if upload_id:
+            request = self.context.get('request')
+            session = UploadSession.objects.filter(pk=upload_id, user=request.user, status='complete').first()
+            if session is None:
+                raise serializers.ValidationError({'upload_id': "Unknown or unfinished upload."})
+            attrs[self.upload_file_field] = session.open_file()
+            self.upload_session = session
+        elif self.instance is None and self.upload_file_field not in attrs:
+            raise serializers.ValidationError({self.upload_file_field: "Provide a file or an upload_id."})
+        return super().validate(attrs)
+
+    def save(self, **kwargs):
+        session = getattr(self, 'upload_session', None)
+        try:
+            instance = super().save(**kwargs)
+        finally:
+            if session is not None:
+                self.validated_data[self.upload_file_field].close()
+        if session is not None:
+            session.discard()
+        return instance
@@ -0,0 +1,119 @@
+import pytest
+from datetime import timedelta
+from io import BytesIO
+from PIL import Image
+from django.utils import timezone
+from rest_framework.test import APIClient
+from artwork.models import Artwork
+from uploads.models import UploadSession
+from users.models import CustomUser
+
+
+def make_png():
+    buffer = BytesIO()
+    Image.new("RGB", (64, 48), "teal").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def put_chunk(client, session_id, data, start, total):
+    return client.generic(
+        "PUT", f"/api/uploads/{session_id}/", data,
+        content_type="application/octet-stream",
+        HTTP_CONTENT_RANGE=f"bytes {start}-{start + len(data) - 1}/{total}",
+    )
+
+
+@pytest.fixture
+def upload_settings(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.UPLOAD_SESSION_DIR = str(tmp_path / "sessions")
+    return settings
+
+
+@pytest.mark.django_db
+def test_chunked_upload_resumes_and_creates_artwork(upload_settings):
+    client = APIClient()
+    user = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    client.force_authenticate(user=user)
+    payload = make_png()
+    half = len(payload) // 2
+
+    response = client.post("/api/uploads/", {"filename": "../big.png", "total_size": len(payload)}, format="json")
+    assert response.status_code == 201
+    session_id = response.data["id"]
+    assert response.data["filename"] == "big.png"
+
+    assert put_chunk(client, session_id, payload[:half], 0, len(payload)).status_code == 200
+    # A retried chunk reports where to resume from
+    response = put_chunk(client, session_id, payload[:half], 0, len(payload))
+    assert response.status_code == 409
+    assert response.data["received_size"] == half
+
+    assert client.post(f"/api/uploads/{session_id}/complete/").status_code == 400
+    assert put_chunk(client, session_id, payload[half:], half, len(payload)).status_code == 200
+    response = client.post(f"/api/uploads/{session_id}/complete/")
+    assert response.status_code == 200
+    assert response.data["status"] == "complete"
+
+    response = client.post("/api/artwork/", {
+        "title": "Chunked", "description": "desc", "upload_id": session_id,
+    }, format="json")
+    assert response.status_code == 201
+    artwork = Artwork.objects.get(title="Chunked")
+    assert artwork.image.read() == payload
+    assert artwork.image.name.endswith(".png")
+    assert not UploadSession.objects.exists()
+
+
+@pytest.mark.django_db
+def test_upload_sessions_are_private_and_must_be_images(upload_settings):
+    client = APIClient()
+    owner = CustomUser.objects.create_user(email="owner@example.com", password="password123", username="owner")
+    other = CustomUser.objects.create_user(email="other@example.com", password="password123", username="other")
+    client.force_authenticate(user=owner)
+
+    session_id = client.post("/api/uploads/", {"filename": "notes.png", "total_size": 5}, format="json").data["id"]
+    assert put_chunk(client, session_id, b"hello", 0, 5).status_code == 200
+    assert client.post(f"/api/uploads/{session_id}/complete/").status_code == 400
+    assert not UploadSession.objects.filter(pk=session_id).exists()
+
+    session_id = client.post("/api/uploads/", {"filename": "a.png", "total_size": 5}, format="json").data["id"]
+    client.force_authenticate(user=other)
+    assert client.get(f"/api/uploads/{session_id}/").status_code == 404
+    response = client.post("/api/artwork/", {"title": "Stolen", "description": "d", "upload_id": session_id}, format="json")
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_chunk_offset_is_leased_while_it_is_written(upload_settings):
+    client = APIClient()
+    user = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    client.force_authenticate(user=user)
+    session_id = client.post("/api/uploads/", {"filename": "a.png", "total_size": 10}, format="json").data["id"]
+
+    # Another request is still writing this offset
+    UploadSession.objects.filter(pk=session_id).update(chunk_lease_expires_at=timezone.now() + timedelta(minutes=1))
+    response = put_chunk(client, session_id, b"hello", 0, 10)
+    assert response.status_code == 409
+    assert response.data["received_size"] == 0
+
+    # Once its lease runs out a retry takes over
+    UploadSession.objects.filter(pk=session_id).update(chunk_lease_expires_at=timezone.now() - timedelta(seconds=1))
+    response = put_chunk(client, session_id, b"hello", 0, 10)
+    assert response.status_code == 200
+    assert response.data["received_size"] == 5
+    assert UploadSession.objects.get(pk=session_id).chunk_lease_expires_at is None
+
+
+@pytest.mark.django_db
+def test_completed_upload_is_named_from_its_detected_format(upload_settings):
+    client = APIClient()
+    user = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    client.force_authenticate(user=user)
+    payload = make_png()
+
+    session_id = client.post("/api/uploads/", {"filename": "evil.html", "total_size": len(payload)}, format="json").data["id"]
+    assert put_chunk(client, session_id, payload, 0, len(payload)).status_code == 200
+    response = client.post(f"/api/uploads/{session_id}/complete/")
+    assert response.status_code == 200
+    assert response.data["filename"] == "evil.png"
@@ -0,0 +1,154 @@
+import os
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.functions import Now
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+from PIL import Image
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from .models import UploadSession
+from .serializers import UploadSessionSerializer
+
+CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+READ_SIZE = 64 * 1024
+# Formats PIL may detect in a finished upload, and the extension the stored file gets
+IMAGE_EXTENSIONS = {
+    'JPEG': 'jpg',
+    'PNG': 'png',
+    'GIF': 'gif',
+    'WEBP': 'webp',
+    'BMP': 'bmp',
+    'TIFF': 'tiff',
+}
+
+
+class UploadSessionViewSet(mixins.CreateModelMixin,
+                           mixins.RetrieveModelMixin,
+                           mixins.DestroyModelMixin,
+                           viewsets.GenericViewSet):
+    """
+    Resumable uploads for large images.
+
+    1. POST /uploads/ {"filename", "total_size"} opens a session.
+    2. PUT /uploads/<id>/ with the raw bytes and
+       `Content-Range: bytes <start>-<end>/<total>` appends a chunk. Chunks
+       must arrive in order; after a failure, GET the session and resume
+       from `received_size`.
+    3. POST /uploads/<id>/complete/ checks the file is a readable image.
+    4. Create the Artwork / EventImage with `upload_id` instead of a file.
+    """
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+    # How long a chunk write may hold its offset before a retry can take over
+    chunk_lease = timedelta(minutes=2)
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        session = serializer.save(user=self.request.user)
+        os.makedirs(settings.UPLOAD_SESSION_DIR, exist_ok=True)
+        open(session.temp_path, 'wb').close()
+
+    def perform_destroy(self, instance):
+        instance.discard()
+
+    def update(self, request, pk=None):
+        match = CONTENT_RANGE_RE.match(request.headers.get('Content-Range', ''))
+        if not match:
+            return Response({"error": "Content-Range: bytes <start>-<end>/<total> is required."}, status=status.HTTP_400_BAD_REQUEST)
+        start, end, total = (int(group) for group in match.groups())
+        length = end - start + 1
+
+        if length <= 0 or length > settings.UPLOAD_CHUNK_MAX_SIZE:
+            return Response({"error": f"Chunks must be 1 to {settings.UPLOAD_CHUNK_MAX_SIZE} bytes."}, status=status.HTTP_400_BAD_REQUEST)
+        if int(request.headers.get('Content-Length') or 0) != length:
+            return Response({"error": "Content-Length does not match Content-Range."}, status=status.HTTP_400_BAD_REQUEST)
+
+        session = self.get_queryset().filter(pk=pk).first()
+        if session is None:
+            return Response({"error": "Upload not found."}, status=status.HTTP_404_NOT_FOUND)
+        if total != session.total_size or end >= session.total_size:
+            return Response({"error": "Range is outside the declared size."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Reserve the offset with one short conditional UPDATE; the body is
+        # read afterwards, so a slow client holds no row lock or transaction
+        now = timezone.now()
+        lease_expires_at = now + self.chunk_lease
+        reserved = (
+            UploadSession.objects.filter(pk=session.pk, status='uploading', received_size=start)
+            .filter(Q(chunk_lease_expires_at__isnull=True) | Q(chunk_lease_expires_at__lte=now))
+            .update(chunk_lease_expires_at=lease_expires_at)
+        )
+        if not reserved:
+            session.refresh_from_db()
+            if session.status != 'uploading':
+                return Response({"error": "Upload is already complete."}, status=status.HTTP_409_CONFLICT)
+            error = "Unexpected offset." if start != session.received_size else "Another chunk is being written."
+            return Response({"error": error, "received_size": session.received_size}, status=status.HTTP_409_CONFLICT)
+
+        # Copy the body to disk in small reads instead of buffering it
+        remaining = length
+        try:
+            with open(session.temp_path, 'r+b') as part:
+                part.seek(start)
+                while remaining:
+                    data = request.stream.read(min(READ_SIZE, remaining))
+                    if not data:
+                        break
+                    part.write(data)
+                    remaining -= len(data)
+        finally:
+            # Move received_size forward (or just drop the lease) only if the lease is still ours
+            advanced = UploadSession.objects.filter(
+                pk=session.pk, received_size=start, chunk_lease_expires_at=lease_expires_at
+            ).update(
+                received_size=start + (0 if remaining else length),
+                chunk_lease_expires_at=None,
+                updated_at=Now(),
+            )
+
+        session.refresh_from_db()
+        if remaining:
+            return Response(
+                {"error": "Chunk was cut short.", "received_size": session.received_size},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not advanced:
+            return Response(
+                {"error": "Chunk took too long and was superseded.", "received_size": session.received_size},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(self.get_serializer(session).data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        session = self.get_object()
+        if session.received_size != session.total_size:
+            return Response(
+                {"error": "Upload is incomplete.", "received_size": session.received_size},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            with Image.open(session.temp_path) as image:
+                image.verify()
+                extension = IMAGE_EXTENSIONS.get(image.format)
+        except Exception:
+            extension = None
+        if extension is None:
+            session.discard()
+            return Response({"error": "Uploaded file is not a supported image."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Name the file after what it actually is, not what the client called it
+        stem = get_valid_filename(os.path.splitext(session.filename)[0]) or 'upload'
+        session.filename = f"{stem[:200]}.{extension}"
+        session.status = 'complete'
+        session.save(update_fields=['filename', 'status', 'updated_at'])
+        return Response(self.get_serializer(session).data, status=status.HTTP_200_OK)
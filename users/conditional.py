@@ -0,0 +1,73 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified support for list and retrieve on a ModelViewSet.
+
+    For lists the ETag comes from one aggregate over the filtered queryset,
+    MAX(updated_at) and COUNT(*), so an unchanged collection is answered
+    with 304 Not Modified before any rows are fetched or serialized.
+    Responses can include per-user fields (e.g. has_liked), so the user id
+    is part of the ETag.
+
+    Last-Modified can carry neither the row count nor the user, so it is
+    only sent (and If-Modified-Since only honoured) for anonymous detail
+    reads. Otherwise a deleted row or another user's copy could be
+    answered with a stale 304.
+
+    Keyset (?pagination=cursor) pages skip the aggregate, since avoiding a
+    scan of the whole filtered set is the point of that mode; they still get
+    a content ETag from ConditionalGetMiddleware.
+    """
+    last_modified_field = 'updated_at'
+
+    def get_etag(self, request, *parts):
+        user_id = request.user.pk if request.user.is_authenticated else 0
+        raw = "|".join(str(part) for part in (request.get_full_path(), user_id, *parts))
+        return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+    def conditional_response(self, request, etag, last_modified):
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+    def set_validators(self, response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        return response
+
+    def uses_keyset_pagination(self, request):
+        mode_param = getattr(self.paginator, 'mode_query_param', None)
+        return mode_param is not None and request.query_params.get(mode_param) == 'cursor'
+
+    def list(self, request, *args, **kwargs):
+        if self.uses_keyset_pagination(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        stats = queryset.order_by().aggregate(
+            last_modified=Max(self.last_modified_field),
+            count=Count('pk'),
+        )
+        etag = self.get_etag(request, stats['count'], stats['last_modified'])
+        not_modified = self.conditional_response(request, etag, None)
+        if not_modified is not None:
+            return not_modified
+        return self.set_validators(super().list(request, *args, **kwargs), etag, None)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        updated_at = getattr(instance, self.last_modified_field)
+        etag = self.get_etag(request, instance.pk, updated_at)
+        last_modified = None if request.user.is_authenticated else updated_at
+        not_modified = self.conditional_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        serializer = self.get_serializer(instance)
+        return self.set_validators(Response(serializer.data), etag, last_modified)
@@ -0,0 +1,58 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F
+from rest_framework import filters
+
+from .search import SEARCH_CONFIG
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    Drop-in replacement for SearchFilter that matches ?search= against the
+    model's GIN-indexed `search_vector` instead of ILIKE '%term%', and ranks
+    results by relevance (title matches weigh more than description).
+
+    Every word is matched as a prefix so search-as-you-type keeps working.
+    Falls back to SearchFilter for models without a search vector and on
+    databases other than PostgreSQL.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        words = re.findall(r"\w+", request.query_params.get(self.search_param, ''))
+        if (
+            not words
+            or connection.vendor != 'postgresql'
+            or not hasattr(queryset.model, 'search_vector_fields')
+        ):
+            return super().filter_queryset(request, queryset, view)
+
+        query = SearchQuery(
+            " & ".join(f"{word}:*" for word in words),
+            search_type='raw',
+            config=SEARCH_CONFIG,
+        )
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(search_rank=SearchRank(F('search_vector'), query))
+            .order_by('-search_rank', *ordering)
+        )
+
+
+class StableOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter that breaks ties on the primary key, in the direction of
+    the first ordering term. Counters such as likes_count or trending_score
+    tie often (every unliked artwork is 0), and without a unique last key
+    page-number pagination can repeat or skip rows between pages. It also
+    matches (-value, -id) indexes such as artwork_trending_idx.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering or any(term.lstrip('-') in ('id', 'pk') for term in ordering):
+            return ordering
+        tie_break = '-id' if ordering[0].startswith('-') else 'id'
+        return [*ordering, tie_break]
@@ -0,0 +1,138 @@
+import colorsys
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import models
+from django.db.models.functions import Now
+from PIL import Image, ImageOps
+
+PALETTE_SIZE = 5
+PALETTE_SAMPLE = 64  # Colours are picked from a 64x64 thumbnail
+
+# EXIF orientations that rotate the image by 90 degrees
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+# Hue ranges (degrees, upper bound exclusive) for saturated colours
+HUE_FAMILIES = [
+    (15, 'red'),
+    (45, 'orange'),
+    (70, 'yellow'),
+    (165, 'green'),
+    (195, 'cyan'),
+    (255, 'blue'),
+    (290, 'purple'),
+    (340, 'pink'),
+    (360, 'red'),
+]
+COLOR_FAMILY_CHOICES = [
+    (family, family.title())
+    for family in ['red', 'orange', 'yellow', 'green', 'cyan', 'blue', 'purple', 'pink', 'black', 'white', 'gray']
+]
+
+
+def color_family(rgb):
+    """Bucket an (r, g, b) colour into one of COLOR_FAMILY_CHOICES."""
+    hue, saturation, value = colorsys.rgb_to_hsv(*(channel / 255 for channel in rgb))
+    if value < 0.2:
+        return 'black'
+    if saturation < 0.15:
+        return 'white' if value > 0.85 else 'gray'
+    degrees = hue * 360
+    return next(family for bound, family in HUE_FAMILIES if degrees < bound)
+
+
+def extract_image_metadata(field_file):
+    """
+    Dimensions, file size and dominant colours of a stored image. The size
+    comes from the header and the palette from a decoder-downscaled copy, so
+    large JPEGs are never fully decoded.
+    """
+    field_file.open("rb")
+    try:
+        with Image.open(field_file) as image:
+            width, height = image.size
+            if image.getexif().get(0x0112) in TRANSPOSED_ORIENTATIONS:
+                width, height = height, width
+
+            image.draft("RGB", (PALETTE_SAMPLE * 2, PALETTE_SAMPLE * 2))
+            sample = image.convert("RGB").resize((PALETTE_SAMPLE, PALETTE_SAMPLE), Image.Resampling.BILINEAR)
+        size = field_file.size
+    finally:
+        field_file.close()
+
+    quantized = sample.quantize(colors=PALETTE_SIZE, method=Image.Quantize.MEDIANCUT)
+    palette = quantized.getpalette()
+    counts = sorted(quantized.getcolors(), reverse=True)
+    colors = [tuple(palette[index * 3:index * 3 + 3]) for _, index in counts]
+
+    return {
+        'image_width': width,
+        'image_height': height,
+        'aspect_ratio': round(width / height, 4) if height else None,
+        'file_size': size,
+        'dominant_colors': ['#%02x%02x%02x' % color for color in colors],
+        'color_family': color_family(colors[0]) if colors else '',
+    }
+
+
+THUMBNAIL_SIZE = 320
+
+
+def save_thumbnail(field_file, path, size=THUMBNAIL_SIZE):
+    """
+    Write a WebP copy of field_file no larger than size x size to `path`
+    in the same storage and return the stored name.
+    """
+    field_file.open("rb")
+    try:
+        with Image.open(field_file) as image:
+            image.draft("RGB", (size * 2, size * 2))
+            thumbnail = ImageOps.exif_transpose(image)
+            thumbnail = thumbnail.convert("RGBA" if thumbnail.mode in ("RGBA", "LA", "PA") else "RGB")
+            thumbnail.thumbnail((size, size), Image.Resampling.LANCZOS)
+    finally:
+        field_file.close()
+
+    buffer = BytesIO()
+    thumbnail.save(buffer, "WEBP", quality=80, method=4)
+    storage = field_file.storage
+    if storage.exists(path):
+        storage.delete(path)
+    return storage.save(path, ContentFile(buffer.getvalue()))
+
+
+EMPTY_IMAGE_METADATA = {
+    'image_width': None,
+    'image_height': None,
+    'aspect_ratio': None,
+    'file_size': None,
+    'dominant_colors': [],
+    'color_family': '',
+}
+
+
+class ImageMetadataModel(models.Model):
+    """
+    Abstract model with precomputed facts about the `image` field, so
+    clients can lay out and filter images without downloading them.
+    Filled in by refresh_image_metadata(), normally from a background job.
+    """
+    image_width = models.PositiveIntegerField(null=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, editable=False)
+    aspect_ratio = models.FloatField(null=True, editable=False)
+    file_size = models.PositiveBigIntegerField(null=True, editable=False)
+    dominant_colors = models.JSONField(default=list, editable=False)
+    color_family = models.CharField(max_length=10, choices=COLOR_FAMILY_CHOICES, blank=True, db_index=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def refresh_image_metadata(self):
+        values = extract_image_metadata(self.image) if self.image else dict(EMPTY_IMAGE_METADATA)
+        for name, value in values.items():
+            setattr(self, name, value)
+
+        # Bump updated_at so cached payloads (ETags) pick up the new fields
+        if any(field.name == 'updated_at' for field in self._meta.fields):
+            values['updated_at'] = Now()
+        type(self)._default_manager.filter(pk=self.pk).update(**values)
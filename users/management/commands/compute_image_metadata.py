@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from artwork.models import Artwork
+from events.models import EventImage
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = "Fill in dimensions, file size and dominant colours for images saved before they were tracked"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Recompute metadata that already exists")
+
+    def handle(self, *args, **options):
+        for model in (Artwork, EventImage, Project):
+            queryset = model.objects.exclude(image="").exclude(image__isnull=True)
+            if not options["force"]:
+                queryset = queryset.filter(image_width__isnull=True)
+
+            done = failed = 0
+            for instance in queryset.iterator(chunk_size=100):
+                try:
+                    instance.refresh_image_metadata()
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"{model.__name__} {instance.pk}: {e}")
+                    continue
+                done += 1
+
+            self.stdout.write(self.style.SUCCESS(f"{model.__name__}: updated {done} images ({failed} failed)."))
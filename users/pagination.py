@@ -1,12 +1,133 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only cursor pagination keyed on a unique ordering such as
+    (submission_date, id). Each page is a single indexed range scan, so deep
+    pages cost the same as the first one and no COUNT(*) is run.
+
+    The view can set `cursor_ordering` to change the key; the last field must
+    be unique so rows with equal timestamps are never skipped. The key is
+    fixed per view, so ?ordering= is rejected rather than silently ignored.
+    """
+    cursor_query_param = 'cursor'
+    cursor_ordering = ('-submission_date', '-id')
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            raise ValidationError({api_settings.ORDERING_PARAM: "Cursor pagination does not support custom ordering."})
+        self.ordering = getattr(view, 'cursor_ordering', self.cursor_ordering)
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            queryset = queryset.filter(self.get_after_filter(queryset, self.decode_cursor(encoded)))
+
+        # Fetch one extra row to know whether there is a next page
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def get_output_field(self, queryset, name):
+        # Keys can be model fields or annotations (e.g. a joined timestamp)
+        if name in queryset.query.annotations:
+            return queryset.query.annotations[name].output_field
+        return queryset.model._meta.get_field(name)
+
+    def cursor_value(self, queryset, name, value):
+        # Cursors come from the client, so a tampered or stale one is a 404, not a 500
+        if value is None:
+            raise NotFound("Invalid cursor.")
+        try:
+            value = self.get_output_field(queryset, name).to_python(value)
+        except (DjangoValidationError, TypeError, ValueError):
+            raise NotFound("Invalid cursor.")
+        if value is None:
+            raise NotFound("Invalid cursor.")
+        return value
+
+    def get_after_filter(self, queryset, values):
+        # (a, b) after (x, y)  =>  a < x OR (a = x AND b < y) for descending keys
+        condition = Q()
+        equal = {}
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            value = self.cursor_value(queryset, name, value)
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+    def encode_cursor(self, obj):
+        values = [getattr(obj, field.lstrip('-')) for field in self.ordering]
+        raw = json.dumps([v.isoformat() if hasattr(v, 'isoformat') else v for v in values])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, encoded):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (ValueError, TypeError):
+            raise NotFound("Invalid cursor.")
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound("Invalid cursor.")
+        return values
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': None,
+            'results': data
+        })
+
 
 class CustomPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 50
 
+    # ?pagination=cursor switches to keyset paging (used by infinite scroll)
+    mode_query_param = 'pagination'
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if request.query_params.get(self.mode_query_param) == 'cursor':
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
     def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
         return Response({
             'total_items': self.page.paginator.count,
             'total_pages': self.page.paginator.num_pages,
@@ -0,0 +1,35 @@
+from functools import reduce
+from operator import add
+
+from django.contrib.postgres.search import SearchVector
+from django.db import connection
+
+SEARCH_CONFIG = 'english'
+
+
+def build_search_vector(weighted_fields):
+    """Weighted tsvector expression for [(field, weight), ...], e.g. [('title', 'A')]."""
+    return reduce(add, [
+        SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        for field, weight in weighted_fields
+    ])
+
+
+class SearchVectorMixin:
+    """
+    Model mixin that refreshes the `search_vector` column after every save
+    that may have changed the indexed text. Subclasses list the indexed
+    text columns in `search_vector_fields`.
+    """
+    search_vector_fields = ()
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        # Counter, status and lease saves name their fields; skip the rebuild for those
+        if update_fields is not None and not {field for field, _ in self.search_vector_fields} & set(update_fields):
+            return
+        if connection.vendor == 'postgresql':
+            type(self)._default_manager.filter(pk=self.pk).update(
+                search_vector=build_search_vector(self.search_vector_fields)
+            )
@@ -0,0 +1,26 @@
+from allauth.account.adapter import get_adapter
+from allauth.account.forms import default_token_generator
+from allauth.account.utils import user_pk_to_url_str
+from django.urls import reverse
+from jobs.registry import job
+from .models import CustomUser
+
+
+@job
+def send_password_reset_email(user_id, base_url):
+    """
+    Email a reset link to one user. base_url is the scheme and host the
+    user called (e.g. "https://example.com"), so the link points back there.
+    """
+    user = CustomUser.objects.filter(pk=user_id, is_active=True).first()
+    if user is None:
+        return
+    token = default_token_generator.make_token(user)
+    uid = user_pk_to_url_str(user)
+    path = reverse("password_reset_confirm", args=[uid, token])
+    get_adapter().send_mail("account/email/password_reset_key", user.email, {
+        "user": user,
+        "password_reset_url": base_url + path,
+        "token": token,
+        "uid": uid,
+    })
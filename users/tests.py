@@ -1,3 +1,60 @@
-from django.test import TestCase
+import pytest
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from artwork.models import Artwork
+from jobs.worker import run_pending
+from users.models import CustomUser
 
-# Create your tests here.
+postgres_only = pytest.mark.skipif(
+    connection.vendor != 'postgresql', reason="full-text search needs PostgreSQL"
+)
+
+
+@postgres_only
+@pytest.mark.django_db
+def test_search_vector_is_filled_and_search_ranks_title_matches_first():
+    artist = CustomUser.objects.create_user(email="artist@example.com", password="password123", username="artist")
+    in_description = Artwork.objects.create(
+        title="Harbour", description="Morning light over the lighthouse", image="artworks/a.jpg",
+        artist=artist, approval_status="approved",
+    )
+    in_title = Artwork.objects.create(
+        title="Lighthouse at dusk", description="Oil on canvas", image="artworks/b.jpg",
+        artist=artist, approval_status="approved",
+    )
+    Artwork.objects.create(
+        title="Still life", description="Fruit bowl", image="artworks/c.jpg",
+        artist=artist, approval_status="approved",
+    )
+    assert Artwork.objects.filter(search_vector__isnull=True).count() == 0
+
+    # A save that doesn't touch the indexed text skips the rebuild
+    with CaptureQueriesContext(connection) as queries:
+        in_title.save(update_fields=['approval_status'])
+    assert len(queries) == 1
+
+    client = APIClient()
+    client.force_authenticate(user=artist)
+    response = client.get("/api/artwork/", {"search": "lighth"})
+    assert response.status_code == 200
+    assert [item["id"] for item in response.data["results"]] == [in_title.id, in_description.id]
+
+
+@pytest.mark.django_db
+def test_password_reset_email_is_sent_by_the_worker(settings):
+    settings.ALLOWED_HOSTS = ["arts.example.com", "testserver"]
+    user = CustomUser.objects.create_user(email="member@example.com", password="password123", username="member")
+    client = APIClient()
+
+    response = client.post("/api/auth/password/reset/", {"email": user.email}, format="json", HTTP_HOST="arts.example.com")
+    assert response.status_code == 200
+    # Unknown addresses get the same answer and no email
+    assert client.post("/api/auth/password/reset/", {"email": "nobody@example.com"}, format="json").status_code == 200
+    assert mail.outbox == []
+
+    run_pending()
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == [user.email]
+    assert "http://arts.example.com/" in mail.outbox[0].body
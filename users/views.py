@@ -8,13 +8,15 @@ from rest_framework.generics import ListAPIView
 from rest_framework import status
 from .models import CustomUser, ActivityLog
 from .serializers import UserSerializer, ProfileUpdateSerializer, ActivityLogSerializer
+from .tasks import send_password_reset_email
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from django.contrib.auth import authenticate
 from rest_framework.parsers import MultiPartParser, FormParser
-from django.db.models import Count, Q
+from django.db.models import Count, Q, Sum
 from rest_framework.views import APIView
-from artwork.models import Artwork
+from artwork.models import Artwork, CategoryStat
+from artwork.stats import get_status_counts
 from events.models import Event
 from projects.models import Project
 from django.utils.timezone import now, timedelta
@@ -213,8 +215,9 @@ class AnalyticsView(APIView):
         user_roles = CustomUser.objects.values('role').annotate(count=Count('role'))
 
         # Resource Counts
-        total_artworks = Artwork.objects.count()
-        pending_artworks = Artwork.objects.filter(approval_status='pending').count()
+        artwork_counts = get_status_counts()
+        total_artworks = artwork_counts['total']
+        pending_artworks = artwork_counts['pending']
         total_events = Event.objects.count()
         total_projects = Project.objects.count()
 
@@ -268,9 +271,12 @@ class MemberStatsView(APIView):
             .order_by("month")
         )
         
-        # Category Distribution
-        category_stats = Artwork.objects.filter(artist=request.user).values("category").annotate(
-            count=Count("category")
+        # Category Distribution (from the per-artist rollup)
+        category_stats = (
+            CategoryStat.objects.filter(artist=request.user, artwork_count__gt=0)
+            .values("category")
+            .annotate(count=Sum("artwork_count"))
+            .order_by("category")
         )
 
         # Recent Activity Logs
@@ -294,7 +300,14 @@ class MemberStatsView(APIView):
 
 class CustomPasswordResetView(PasswordResetView):
     def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # Sending the email is slow, so the worker does it. The form has
+        # already looked up the active accounts for this address.
+        base_url = f"{request.scheme}://{request.get_host()}"
+        for user in serializer.reset_form.users:
+            send_password_reset_email.enqueue(user_id=user.pk, base_url=base_url)
         return Response({"message": "If your email exists, a reset link has been sent."})
     
 
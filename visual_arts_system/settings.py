@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third-party apps
     'django.contrib.sites',
@@ -58,6 +59,8 @@ INSTALLED_APPS = [
     "projects",
     "logs",
     "notifications",
+    "jobs",
+    "uploads",
 ]
 
 
@@ -94,6 +97,7 @@ MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',  # ETag + 304 for responses without their own validators
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -189,6 +193,16 @@ STATIC_ROOT = BASE_DIR/'staticfiles'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Shared by all gunicorn workers so invalidation reaches every process
+# (create the table with `python manage.py createcachetable`)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+    }
+}
+
+
 AUTH_USER_MODEL = "users.CustomUser"
 
 
@@ -203,3 +217,9 @@ DEFAULT_FROM_EMAIL = 'Visual Arts <visualarts@gmail.com>'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Resumable uploads: chunks are assembled here (outside MEDIA_ROOT) until the
+# artwork or gallery image that uses them is saved
+UPLOAD_SESSION_DIR = os.path.join(BASE_DIR, 'upload_sessions')
+UPLOAD_SESSION_MAX_SIZE = 100 * 1024 * 1024
+UPLOAD_CHUNK_MAX_SIZE = 5 * 1024 * 1024
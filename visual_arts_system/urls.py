@@ -27,6 +27,7 @@ urlpatterns = [
     path('api/', include('notifications.urls')),
     path('api/', include('logs.urls')),
     path('api/', include('users.urls')),
+    path('api/', include('uploads.urls')),
 ]
 
 